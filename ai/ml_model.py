@@ -1,33 +1,188 @@
-import pickle
+import json
+import threading
+import joblib
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
 
-def train_model(data, labels):
+# Traffic class names, indexed by the integer label the model is trained on
+TRAFFIC_CLASSES = np.array(["NORMAL", "CRITICAL", "SECURE"])
+
+def decode_labels(predictions):
+    """Map integer class labels to TRAFFIC_CLASSES names; string labels pass through."""
+    predictions = np.asarray(predictions)
+    if predictions.dtype.kind in "iu":
+        return TRAFFIC_CLASSES[predictions]
+    return predictions
+
+def train_model(data, labels, n_estimators=100, max_depth=None, max_leaf_nodes=None):
     """
     Train a RandomForestClassifier model.
 
     Parameters:
         data (numpy.ndarray): Feature matrix.
         labels (numpy.ndarray): Target labels.
+        n_estimators (int): Number of trees in the forest.
+        max_depth (int): Maximum depth of each tree (None = unlimited).
+        max_leaf_nodes (int): Maximum leaves per tree (None = unlimited).
 
     Returns:
         model: Trained RandomForestClassifier model.
     """
-    model = RandomForestClassifier(n_estimators=100, random_state=42)
+    # sklearn trees split on float32 internally; converting once up front
+    # avoids a hidden copy inside fit()
+    data = np.ascontiguousarray(data, dtype=np.float32)
+    model = RandomForestClassifier(
+        n_estimators=n_estimators,
+        max_depth=max_depth,
+        max_leaf_nodes=max_leaf_nodes,
+        random_state=42
+    )
     model.fit(data, labels)
     return model
 
-def save_model(model, filename="traffic_model.pkl"):
-    """Save the trained model to a file."""
+def select_model_size(X_train, y_train, X_val, y_val,
+                      n_estimators_grid=(10, 25, 50, 100),
+                      max_depth_grid=(4, 8, 12, None),
+                      tolerance=0.01):
+    """
+    Find the smallest forest whose accuracy stays close to the best one.
+
+    Memory and prediction time grow with the number of trees and nodes, so
+    among all configurations within `tolerance` of the best validation
+    accuracy the one with the fewest total nodes is kept.
+
+    Parameters:
+        X_train, y_train: Training data and labels.
+        X_val, y_val: Validation data and labels.
+        n_estimators_grid (tuple): Tree counts to try.
+        max_depth_grid (tuple): Depth limits to try (None = unlimited).
+        tolerance (float): Allowed accuracy drop from the best configuration.
+
+    Returns:
+        dict: train_model() keyword arguments for the selected configuration.
+    """
+    X_val = np.ascontiguousarray(X_val, dtype=np.float32)
+    candidates = []
+    for n_estimators in n_estimators_grid:
+        for max_depth in max_depth_grid:
+            model = train_model(X_train, y_train, n_estimators=n_estimators, max_depth=max_depth)
+            accuracy = model.score(X_val, y_val)
+            node_count = sum(t.tree_.node_count for t in model.estimators_)
+            params = {"n_estimators": n_estimators, "max_depth": max_depth}
+            candidates.append((accuracy, node_count, params))
+
+    best_accuracy = max(c[0] for c in candidates)
+    eligible = [c for c in candidates if c[0] >= best_accuracy - tolerance]
+    return min(eligible, key=lambda c: c[1])[2]
+
+def save_model(model, filename="traffic_model.joblib"):
+    """
+    Save the trained model to a file.
+
+    Uncompressed so the tree arrays can be memory-mapped by load_model().
+    """
+    joblib.dump(model, filename)
+
+def load_model(filename="traffic_model.joblib"):
+    """
+    Load a trained model from a file.
+
+    Numpy arrays in the file are memory-mapped read-only, which saves reading
+    them into a buffer first. sklearn's trees still copy their node and value
+    arrays when unpickled, so each process that loads the file holds its own
+    copy; workers share one model only when it is loaded once before forking
+    (gunicorn --preload, copy-on-write).
+    """
+    return joblib.load(filename, mmap_mode="r")
+
+def save_onnx_model(model, filename="traffic_model.onnx"):
+    """
+    Convert the trained model to ONNX and save it to a file.
+
+    Requires the optional skl2onnx package.
+    """
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    onnx_model = convert_sklearn(
+        model, initial_types=[("input", FloatTensorType([None, 5]))]
+    )
     with open(filename, "wb") as f:
-        pickle.dump(model, f)
+        f.write(onnx_model.SerializeToString())
+
+
+class OnnxTrafficModel:
+    """
+    onnxruntime-backed model exposing the same predict() interface as sklearn.
+
+    Tree traversal runs in onnxruntime's native kernel instead of sklearn's
+    per-estimator Python loop.
+    """
 
-def load_model(filename="traffic_model.pkl"):
-    """Load a trained model from a file."""
-    with open(filename, "rb") as f:
-        return pickle.load(f)
+    def __init__(self, filename="traffic_model.onnx"):
+        import onnxruntime as ort
+
+        self.session = ort.InferenceSession(filename, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.label_name = self.session.get_outputs()[0].name
+
+    def predict(self, X):
+        """Return predicted labels for a (n_samples, 5) feature matrix."""
+        X = np.asarray(X, dtype=np.float32)
+        return self.session.run([self.label_name], {self.input_name: X})[0]
+
+
+def load_onnx_model(filename="traffic_model.onnx"):
+    """Load an ONNX model exported by save_onnx_model()."""
+    return OnnxTrafficModel(filename)
+
+def save_treelite_model(model, libpath="traffic_model.so", classes_file="traffic_model_classes.json"):
+    """
+    Compile the trained forest to a native shared library with Treelite.
+
+    Each tree is emitted as C code and compiled with gcc. The class labels are
+    written alongside so predictions can be decoded without the sklearn model.
+    Requires the optional treelite package.
+    """
+    import treelite
+    import treelite.sklearn
+
+    tl_model = treelite.sklearn.import_model(model)
+    tl_model.export_lib(toolchain="gcc", libpath=libpath, params={"parallel_comp": 8})
+    with open(classes_file, "w") as f:
+        json.dump(model.classes_.tolist(), f)
+
+
+class TreelitePredictor:
+    """
+    Treelite-backed model exposing the same predict() interface as sklearn.
+
+    The compiled library returns per-class probabilities; the highest scoring
+    class is mapped back to its label.
+    """
+
+    def __init__(self, libpath="traffic_model.so", classes_file="traffic_model_classes.json"):
+        import treelite_runtime
+
+        self._dmatrix = treelite_runtime.DMatrix
+        self.predictor = treelite_runtime.Predictor(libpath)
+        with open(classes_file) as f:
+            self.classes = np.array(json.load(f))
+
+    def predict(self, X):
+        """Return predicted labels for a (n_samples, 5) feature matrix."""
+        X = np.asarray(X, dtype=np.float32)
+        proba = self.predictor.predict(self._dmatrix(X))
+        return self.classes[np.argmax(np.atleast_2d(proba), axis=1)]
+
+
+def load_treelite_model(libpath="traffic_model.so", classes_file="traffic_model_classes.json"):
+    """Load a model compiled by save_treelite_model()."""
+    return TreelitePredictor(libpath, classes_file)
+
+_predict_buf = threading.local()
 
 def predict_traffic(model, features):
     """
@@ -40,5 +195,24 @@ def predict_traffic(model, features):
     Returns:
         str: Predicted class (NORMAL, CRITICAL, SECURE).
     """
-    prediction = model.predict([features])
-    return prediction[0]
\ No newline at end of file
+    # Reuse one 1x5 float32 input per thread instead of converting a new list each call
+    buf = getattr(_predict_buf, "x", None)
+    if buf is None:
+        buf = _predict_buf.x = np.empty((1, 5), dtype=np.float32)
+    buf[0] = features
+    prediction = model.predict(buf)
+    return decode_labels(prediction)[0]
+
+def predict_traffic_batch(model, features_batch):
+    """
+    Predict traffic classification for several samples in a single model call.
+
+    Parameters:
+        model: Trained model.
+        features_batch (list): List of feature lists, each [latency, throughput, packet_loss, jitter, traffic_volume].
+
+    Returns:
+        numpy.ndarray: Predicted classes, one per input sample.
+    """
+    X = np.asarray(features_batch, dtype=np.float32)
+    return decode_labels(model.predict(X))
@@ -1,12 +1,253 @@
-from flask import Flask, request, jsonify
+import math
+import os
+import queue
+import threading
+import time
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-from ml_model import load_model, predict_traffic
+
+try:
+    import redis
+except ImportError:  # Prediction cache is optional
+    redis = None
+
+try:
+    import orjson
+except ImportError:  # Fall back to Flask's stdlib-based JSON handling
+    orjson = None
+from ml_model import load_model, load_onnx_model, load_treelite_model, predict_traffic_batch
+from shared_metrics import SharedMetricsReader
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all domains
 
+MODEL_FILE = "traffic_model.joblib"
+ONNX_MODEL_FILE = "traffic_model.onnx"
+TREELITE_MODEL_FILE = "traffic_model.so"
+
+
+def _export_is_current(path):
+    """
+    True when an exported model exists and is not older than the joblib model.
+
+    train_model.py skips an export when its optional package is missing, so a
+    file left from an earlier run would otherwise be served instead of the
+    newly trained model.
+    """
+    try:
+        exported = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+    try:
+        current = exported >= os.stat(MODEL_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return True
+    if not current:
+        app.logger.warning(f"Ignoring {path}: older than {MODEL_FILE}")
+    return current
+
+
+def _load_serving_model():
+    """
+    Pick the fastest available model backend.
+
+    Order: ONNX (onnxruntime), Treelite compiled library, then the sklearn model.
+    Compiled backends are skipped when their runtime package is not installed
+    or their file predates the sklearn model.
+    """
+    if _export_is_current(ONNX_MODEL_FILE):
+        try:
+            return load_onnx_model(ONNX_MODEL_FILE)
+        except ImportError:
+            pass
+    if _export_is_current(TREELITE_MODEL_FILE):
+        try:
+            return load_treelite_model(TREELITE_MODEL_FILE)
+        except ImportError:
+            pass
+    return load_model(MODEL_FILE)
+
+
 # Load the trained model
-model = load_model()
+model = _load_serving_model()
+
+# RandomForest parallel predict only adds joblib overhead for small batches;
+# scale out with server worker processes instead
+if hasattr(model, "n_jobs"):
+    model.n_jobs = 1
+
+# Input features, in the order expected by the model
+FEATURE_NAMES = ("latency", "throughput", "packet_loss", "jitter", "traffic_volume")
+
+# Micro-batching: concurrent requests are coalesced into one model.predict() call
+MAX_BATCH_SIZE = 64        # Maximum samples per model call
+BATCH_WINDOW_S = 0.005     # How long the worker waits for more requests to join a batch
+REQUEST_TIMEOUT_S = 5.0    # How long a request waits for its prediction
+
+_pending = queue.Queue()
+
+# Prediction cache: features are quantized so near-identical requests share a key
+REDIS_HOST = "127.0.0.1"
+REDIS_PORT = 6379
+CACHE_TTL_S = 60
+QUANT_SCALE = (10, 1, 100, 10, 1)  # Per-feature multiplier before truncating to int
+
+_cache = None
+if redis is not None:
+    _cache = redis.Redis(connection_pool=redis.ConnectionPool(
+        host=REDIS_HOST, port=REDIS_PORT, decode_responses=True,
+        socket_connect_timeout=0.05, socket_timeout=0.05
+    ))
+
+
+def _cache_key(features):
+    """Build the cache key from quantized feature values."""
+    return "pred:" + ":".join(str(int(v * q)) for v, q in zip(features, QUANT_SCALE))
+
+
+def _cache_get(key):
+    """Return a cached prediction, or None on miss or when Redis is unavailable."""
+    if _cache is None:
+        return None
+    try:
+        return _cache.get(key)
+    except redis.RedisError:
+        return None
+
+
+def _cache_set(key, prediction):
+    """Store a prediction with CACHE_TTL_S expiry, ignoring Redis failures."""
+    if _cache is None:
+        return
+    try:
+        _cache.setex(key, CACHE_TTL_S, str(prediction))
+    except redis.RedisError:
+        pass
+
+
+def _batch_worker():
+    """
+    Background worker that drains pending requests and predicts them together.
+
+    Each queue item is (features, event, result_holder). The worker collects up
+    to MAX_BATCH_SIZE items within BATCH_WINDOW_S, runs a single prediction,
+    then writes each result back and wakes the waiting request.
+    """
+    while True:
+        batch = [_pending.get()]
+        deadline = time.monotonic() + BATCH_WINDOW_S
+        while len(batch) < MAX_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        try:
+            predictions = predict_traffic_batch(model, [item[0] for item in batch])
+        except Exception as e:
+            predictions = [e] * len(batch)
+
+        for (_, event, result_holder), prediction in zip(batch, predictions):
+            result_holder.append(prediction)
+            event.set()
+
+
+def _start_batch_worker():
+    """Start the batch worker with a fresh request queue for this process."""
+    global _pending
+    _pending = queue.Queue()
+    threading.Thread(target=_batch_worker, daemon=True).start()
+
+
+_start_batch_worker()
+# Threads do not survive fork: each pre-forked server worker (gunicorn --preload)
+# starts its own batch worker, while sharing the model loaded in the parent
+os.register_at_fork(after_in_child=_start_batch_worker)
+
+
+def _parse_json():
+    """Parse the request body as JSON (orjson when available)."""
+    if orjson is None:
+        return request.get_json(silent=True)
+    try:
+        return orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        return None
+
+
+def _json_response(obj, status=200):
+    """Serialize a response body with orjson, or jsonify when it is not installed."""
+    if orjson is None:
+        return jsonify(obj), status
+    return Response(orjson.dumps(obj), status=status, mimetype="application/json")
+
+
+# Per-slice features published by the controller through shared memory
+_slice_metrics = None
+_slice_metrics_lock = threading.Lock()
+
+# The controller publishes every 5 s; snapshots published longer ago than this
+# (or never) are reported stale
+STALE_AFTER_S = 15
+
+
+def _read_slice_metrics():
+    """
+    Snapshot the controller's shared metrics, attaching on first use.
+
+    Re-attaches when a restarted controller has replaced the block.
+
+    Returns:
+        tuple: (seq, slice_names, features, age_s) with age_s the seconds since
+        the controller published the snapshot, or None when no block is available
+    """
+    global _slice_metrics
+    with _slice_metrics_lock:
+        if _slice_metrics is not None and _slice_metrics.replaced():
+            _slice_metrics.close()
+            _slice_metrics = None
+        if _slice_metrics is None:
+            try:
+                _slice_metrics = SharedMetricsReader()
+            except FileNotFoundError:
+                return None
+        snapshot = _slice_metrics.read()
+        if snapshot is None:
+            return None
+        return snapshot + (_slice_metrics.age(),)
+
+
+@app.route("/predict/slices", methods=["GET"])
+def predict_slices():
+    """
+    Classify the latest per-slice metrics published by the controller.
+
+    Response JSON format:
+        {
+            "seq": int,
+            "age_s": float,  # Seconds since the controller last published
+            "predictions": {"<slice name>": "NORMAL" | "CRITICAL" | "SECURE", ...}
+        }
+
+    Returns 503 when the controller is not publishing, or has not published
+    for STALE_AFTER_S seconds.
+    """
+    snapshot = _read_slice_metrics()
+    if snapshot is None:
+        return _json_response({"error": "Controller metrics not available"}, 503)
+    seq, slice_names, features, age_s = snapshot
+    if age_s > STALE_AFTER_S:
+        # JSON has no infinity: a block the controller never published to has no age
+        age_s = round(age_s, 1) if math.isfinite(age_s) else None
+        return _json_response({"error": "Controller metrics are stale", "seq": seq, "age_s": age_s}, 503)
+    age_s = round(age_s, 1)
+    predictions = predict_traffic_batch(model, features) if slice_names else []
+    return _json_response({"seq": seq, "age_s": age_s,
+                           "predictions": {name: str(p) for name, p in zip(slice_names, predictions)}})
+
 
 @app.route("/predict", methods=["POST"])
 def predict():
@@ -27,17 +268,34 @@ def predict():
             "prediction": "NORMAL" | "CRITICAL" | "SECURE"
         }
     """
-    data = request.get_json()
-    features = [
-        data.get("latency"),
-        data.get("throughput"),
-        data.get("packet_loss"),
-        data.get("jitter"),
-        data.get("traffic_volume")
-    ]
+    data = _parse_json()
+    try:
+        features = [float(data.get(name)) for name in FEATURE_NAMES]
+        # float() accepts "nan", "inf" and 1e999, which the model and the
+        # cache key cannot use
+        if not all(map(math.isfinite, features)):
+            raise ValueError("non-finite feature")
+    except (AttributeError, TypeError, ValueError):
+        return _json_response({"error": f"Expected finite numeric fields: {', '.join(FEATURE_NAMES)}"}, 400)
+
+    key = _cache_key(features)
+    cached = _cache_get(key)
+    if cached is not None:
+        return _json_response({"prediction": cached})
+
+    event = threading.Event()
+    result_holder = []
+    _pending.put((features, event, result_holder))
+    if not event.wait(REQUEST_TIMEOUT_S):
+        return _json_response({"error": "Prediction timed out"}, 503)
 
-    prediction = predict_traffic(model, features)
-    return jsonify({"prediction": prediction})
+    prediction = result_holder[0]
+    if isinstance(prediction, Exception):
+        raise prediction
+    _cache_set(key, prediction)
+    return _json_response({"prediction": str(prediction)})
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
+    # Development server. For production, preload the model once and fork workers:
+    #   gunicorn --preload --workers 4 --threads 8 --bind 0.0.0.0:5000 predictor_api:app
+    app.run(host="0.0.0.0", port=5000)
@@ -0,0 +1,172 @@
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# Shared-memory block the controller publishes per-slice features into
+SHM_NAME = "sdn_metrics"
+SHM_DIR = "/dev/shm"  # Where POSIX shared memory blocks appear on Linux
+MAX_SLICES = 8
+NUM_FEATURES = 5  # latency, throughput, packet_loss, jitter, traffic_volume
+THROUGHPUT_COL = 1
+TRAFFIC_VOLUME_COL = 4
+
+# Layout: [seq:uint64][num_slices:uint32][pad:uint32][published:float64]
+#         [names:128 bytes][features:float32 MAX_SLICES x 5]
+_HEADER = struct.Struct("=QI4x")
+_PUBLISHED = struct.Struct("=d")  # time.time() of the last publish(), 0 before the first
+_PUBLISHED_OFFSET = _HEADER.size
+_NAMES_OFFSET = _PUBLISHED_OFFSET + _PUBLISHED.size
+_NAMES_SIZE = 128
+_FEATURES_OFFSET = _NAMES_OFFSET + _NAMES_SIZE
+SHM_SIZE = _FEATURES_OFFSET + MAX_SLICES * NUM_FEATURES * 4
+
+
+def _features_view(shm):
+    """View the feature rows of the shared block as a (MAX_SLICES, 5) float32 array."""
+    return np.ndarray((MAX_SLICES, NUM_FEATURES), dtype=np.float32,
+                      buffer=shm.buf, offset=_FEATURES_OFFSET)
+
+
+class SharedMetricsWriter:
+    """
+    Single-producer side of the controller -> predictor metrics handoff.
+
+    Rows are protected by a sequence counter (seqlock): it is odd while a
+    write is in progress and even once the rows are consistent, so readers
+    never need a lock.
+    """
+
+    def __init__(self, slice_names, name=SHM_NAME):
+        if len(slice_names) > MAX_SLICES:
+            raise ValueError(f"At most {MAX_SLICES} slices fit in shared memory")
+        names = "\n".join(slice_names).encode()
+        if len(names) > _NAMES_SIZE:
+            raise ValueError("Slice names do not fit in shared memory header")
+
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=SHM_SIZE)
+        except FileExistsError:
+            # Left over from a run whose resource tracker did not unlink it
+            # (normally the block is removed when the controller exits)
+            self._shm = shared_memory.SharedMemory(name=name)
+            if self._shm.size < SHM_SIZE:
+                self._shm.close()
+                raise
+
+        self._seq = _HEADER.unpack_from(self._shm.buf, 0)[0] & ~1
+        self._features = _features_view(self._shm)
+        self._begin()
+        self._shm.buf[_NAMES_OFFSET:_NAMES_OFFSET + _NAMES_SIZE] = names.ljust(_NAMES_SIZE, b"\0")
+        self._features[:] = 0
+        _HEADER.pack_into(self._shm.buf, 0, self._seq, len(slice_names))
+        _PUBLISHED.pack_into(self._shm.buf, _PUBLISHED_OFFSET, 0.0)
+        self._num_slices = len(slice_names)
+        self._end()
+
+    def _begin(self):
+        self._seq += 1
+        struct.pack_into("=Q", self._shm.buf, 0, self._seq)
+
+    def _end(self):
+        self._seq += 1
+        struct.pack_into("=Q", self._shm.buf, 0, self._seq)
+
+    def publish(self, throughput, traffic_volume):
+        """
+        Publish the latest per-slice values.
+
+        Args:
+            throughput: Per-slice bandwidth in Mbps
+            traffic_volume: Per-slice traffic counter
+
+        Features the controller does not measure stay at 0. The publish time
+        is stored with the rows, so readers can tell how old they are.
+        """
+        n = self._num_slices
+        self._begin()
+        self._features[:n, THROUGHPUT_COL] = throughput
+        self._features[:n, TRAFFIC_VOLUME_COL] = traffic_volume
+        _PUBLISHED.pack_into(self._shm.buf, _PUBLISHED_OFFSET, time.time())
+        self._end()
+
+    def close(self):
+        """Detach and remove the shared-memory block."""
+        del self._features
+        self._shm.close()
+        self._shm.unlink()
+
+
+def _block_inode(name):
+    """Inode of the named block, which changes when a new writer recreates it."""
+    return os.stat(os.path.join(SHM_DIR, name)).st_ino
+
+
+class SharedMetricsReader:
+    """
+    Lock-free reader for the block published by SharedMetricsWriter.
+
+    A restarted controller creates a new block under the same name while this
+    reader stays mapped to the old, unlinked one; replaced() detects that so
+    the caller can attach again.
+    """
+
+    def __init__(self, name=SHM_NAME):
+        self._name = name
+        # Taken before attaching, so a block replaced in between reads as
+        # replaced (one extra re-attach) rather than as current
+        self._inode = _block_inode(name)
+        self._shm = shared_memory.SharedMemory(name=name)
+        # The writer owns the block; stop this process's resource tracker
+        # from unlinking it on exit
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+        self._features = _features_view(self._shm)
+        self._published = 0.0
+
+    def replaced(self):
+        """True when the block was unlinked or recreated since this reader attached."""
+        try:
+            return _block_inode(self._name) != self._inode
+        except FileNotFoundError:
+            return True
+
+    def age(self):
+        """
+        Seconds since the writer published the snapshot last returned by read().
+
+        Infinite before the first successful read() and while the writer has
+        not published yet.
+        """
+        if not self._published:
+            return float("inf")
+        return time.time() - self._published
+
+    def read(self, retries=100):
+        """
+        Return a consistent snapshot of the published metrics.
+
+        Returns:
+            tuple: (seq, slice_names, features) where features is a
+            (num_slices, 5) float32 copy, or None if the writer kept the
+            block busy for all retries.
+        """
+        buf = self._shm.buf
+        for _ in range(retries):
+            seq, n = _HEADER.unpack_from(buf, 0)
+            if seq & 1:
+                continue
+            published = _PUBLISHED.unpack_from(buf, _PUBLISHED_OFFSET)[0]
+            names = bytes(buf[_NAMES_OFFSET:_NAMES_OFFSET + _NAMES_SIZE]).rstrip(b"\0")
+            features = self._features[:n].copy()
+            if _HEADER.unpack_from(buf, 0)[0] == seq:
+                self._published = published
+                slice_names = names.decode().split("\n") if n else []
+                return seq, slice_names, features
+        return None
+
+    def close(self):
+        """Detach from the shared-memory block."""
+        del self._features
+        self._shm.close()
@@ -1,7 +1,7 @@
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
-from ml_model import train_model, save_model
+from ml_model import TRAFFIC_CLASSES, train_model, select_model_size, save_model, save_onnx_model, save_treelite_model
 
 def generate_synthetic_data():
     """
@@ -10,14 +10,15 @@ def generate_synthetic_data():
     Returns:
         tuple: Feature matrix and labels.
     """
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     num_samples = 1000
 
     # Features: latency, throughput, packet_loss, jitter, traffic_volume
-    data = np.random.rand(num_samples, 5) * [100, 1000, 10, 50, 10000]
+    data = rng.random((num_samples, 5), dtype=np.float32)
+    data *= np.array([100, 1000, 10, 50, 10000], dtype=np.float32)
 
-    # Labels: NORMAL, CRITICAL, SECURE
-    labels = np.random.choice(["NORMAL", "CRITICAL", "SECURE"], size=num_samples)
+    # Labels: integer codes into TRAFFIC_CLASSES (NORMAL, CRITICAL, SECURE)
+    labels = rng.integers(0, len(TRAFFIC_CLASSES), size=num_samples, dtype=np.uint8)
 
     return data, labels
 
@@ -28,16 +29,34 @@ def main():
     # Split data into training and testing sets
     X_train, X_test, y_train, y_test = train_test_split(data, labels, test_size=0.2, random_state=42)
 
-    # Train the model
-    model = train_model(X_train, y_train)
+    # Train the smallest model that keeps validation accuracy
+    X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.2, random_state=42)
+    params = select_model_size(X_fit, y_fit, X_val, y_val)
+    print(f"Selected model size: {params}")
+    model = train_model(X_train, y_train, **params)
 
     # Evaluate the model
     y_pred = model.predict(X_test)
     print("Classification Report:")
-    print(classification_report(y_test, y_pred))
+    print(classification_report(y_test, y_pred, labels=range(len(TRAFFIC_CLASSES)),
+                                target_names=TRAFFIC_CLASSES))
 
     # Save the model
     save_model(model)
 
+    # Export an ONNX copy for faster serving (optional dependency)
+    try:
+        save_onnx_model(model)
+        print("ONNX model exported to traffic_model.onnx")
+    except ImportError:
+        print("skl2onnx not installed - skipping ONNX export")
+
+    # Compile the forest to native code with Treelite (optional dependency)
+    try:
+        save_treelite_model(model)
+        print("Treelite model compiled to traffic_model.so")
+    except ImportError:
+        print("treelite not installed - skipping native compilation")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
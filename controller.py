@@ -19,12 +19,16 @@ Features:
 Author: SDN-5G Project
 """
 
+import os
 import json
 import time
+import struct
 import logging
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
 from ryu.base import app_manager
 from ryu.controller import ofp_event
 from ryu.controller.handler import CONFIG_DISPATCHER, MAIN_DISPATCHER, set_ev_cls
@@ -32,10 +36,81 @@ from ryu.ofproto import ofproto_v1_3
 from ryu.lib.packet import packet, ethernet, ipv4, udp
 from ryu.lib import hub
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json for metrics export
+    orjson = None
+
+try:
+    from ai.shared_metrics import SharedMetricsWriter
+except ImportError:  # Predictor handoff is optional
+    SharedMetricsWriter = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('SlicingController')
 
+ETH_TYPE_IPV4 = 0x0800
+ETH_TYPE_VLAN = 0x8100
+ETH_TYPE_QINQ = 0x88a8
+IP_PROTO_UDP = 17
+
+
+def _fast_classify(data):
+    """
+    Extract the fields the packet-in handler needs straight from the frame.
+    
+    Reads Ethernet addresses/type, an optional single 802.1Q tag, and the
+    UDP destination port of unfragmented IPv4 packets at fixed offsets,
+    without building Ryu protocol objects.
+    
+    Args:
+        data: Raw frame bytes from the packet-in message
+    
+    Returns:
+        (dst_mac, src_mac, ethertype, udp_dst) with udp_dst None for non-UDP
+        traffic, or None if the frame is too short or uses stacked VLAN tags
+        (callers then fall back to Ryu's full parser).
+    """
+    if len(data) < 14:
+        return None
+    dst, src, ethertype = struct.unpack_from('!6s6sH', data, 0)
+    
+    l3_type, offset = ethertype, 14
+    if ethertype == ETH_TYPE_VLAN:
+        if len(data) < 18:
+            return None
+        (l3_type,) = struct.unpack_from('!H', data, 16)
+        offset = 18
+    if l3_type in (ETH_TYPE_VLAN, ETH_TYPE_QINQ) or ethertype == ETH_TYPE_QINQ:
+        return None
+    
+    udp_dst = None
+    if l3_type == ETH_TYPE_IPV4 and len(data) >= offset + 20:
+        ver_ihl, = struct.unpack_from('!B', data, offset)
+        frag, _, proto = struct.unpack_from('!HBB', data, offset + 6)
+        l4_offset = offset + (ver_ihl & 0x0F) * 4
+        # Only the first fragment carries the UDP header
+        if (proto == IP_PROTO_UDP and frag & 0x1FFF == 0
+                and len(data) >= l4_offset + 4):
+            (udp_dst,) = struct.unpack_from('!H', data, l4_offset + 2)
+    
+    return dst.hex(':'), src.hex(':'), ethertype, udp_dst
+
+
+def _full_classify(data):
+    """Slow-path equivalent of _fast_classify() using Ryu's packet parser."""
+    pkt = packet.Packet(data)
+    eth = pkt.get_protocol(ethernet.ethernet)
+    if eth is None:
+        return None
+    udp_dst = None
+    if pkt.get_protocol(ipv4.ipv4):
+        udp_pkt = pkt.get_protocol(udp.udp)
+        if udp_pkt:
+            udp_dst = udp_pkt.dst_port
+    return eth.dst, eth.src, eth.ethertype, udp_dst
+
 
 class SlicingController(app_manager.RyuApp):
     """
@@ -48,6 +123,9 @@ class SlicingController(app_manager.RyuApp):
     # Use OpenFlow 1.3
     OFP_VERSIONS = [ofproto_v1_3.OFP_VERSION]
     
+    # Rotate flow_metrics.json to flow_metrics.json.1 (one archive kept) past this size
+    METRICS_MAX_BYTES = 64 * 1024 * 1024
+    
     # Slice definitions: port -> (slice_name, dscp_value, meter_id, rate_kbps)
     # DSCP values: URLLC=46 (EF), eMBB=34 (AF41), mMTC=10 (AF11)
     SLICE_CONFIG = {
@@ -83,21 +161,53 @@ class SlicingController(app_manager.RyuApp):
         # Flow statistics storage
         self.flow_stats = {}
         
-        # Metrics storage for export
-        self.metrics = {
-            'URLLC': {'bytes': 0, 'packets': 0, 'bandwidth_mbps': 0},
-            'eMBB': {'bytes': 0, 'packets': 0, 'bandwidth_mbps': 0},
-            'mMTC': {'bytes': 0, 'packets': 0, 'bandwidth_mbps': 0}
+        # Slice lookup tables for the stats handler: UDP port -> slice index
+        self._slice_names = tuple(cfg['name'] for cfg in self.SLICE_CONFIG.values())
+        self._port_to_slice_idx = {port: i for i, port in enumerate(self.SLICE_CONFIG)}
+        
+        # Per-slice flow rule templates, built once and reused on every switch connect
+        self._slice_templates = {
+            port: {
+                'name': cfg['name'],
+                'match_kwargs': dict(eth_type=0x0800, ip_proto=17, udp_dst=port),
+                'dscp': cfg['dscp'],
+                'meter_id': cfg['meter_id'],
+                'priority': cfg['priority']
+            }
+            for port, cfg in self.SLICE_CONFIG.items()
         }
         
-        # Previous stats for bandwidth calculation
-        self.prev_stats = {}
+        # DSCP-marking action lists for slice flows, keyed by (dscp, out_port).
+        # Actions are never mutated after construction, so they are shared.
+        self._action_cache = {}
+        
+        # Metrics storage for export: one array per field, indexed like
+        # self._slice_names (dict form is built only in get_metrics())
+        num_slices = len(self._slice_names)
+        self._bytes = np.zeros(num_slices, dtype=np.int64)
+        self._pkts = np.zeros(num_slices, dtype=np.int64)
+        self._bw = np.zeros(num_slices, dtype=np.float64)
+        
+        # Previous byte counters (per slice index) for bandwidth calculation
+        self._prev_bytes = np.zeros(len(self._slice_names), dtype=np.int64)
         self.prev_time = time.time()
         
         # Metrics output directory
         self.metrics_dir = Path('monitoring/metrics')
         self.metrics_dir.mkdir(parents=True, exist_ok=True)
         
+        # Keep the metrics file open; each export is a single O_APPEND write
+        self._metrics_path = self.metrics_dir / 'flow_metrics.json'
+        self._open_metrics_file()
+        
+        # Latest per-slice features shared with the AI predictor (no JSON/HTTP hop)
+        self._shared_metrics = None
+        if SharedMetricsWriter is not None:
+            try:
+                self._shared_metrics = SharedMetricsWriter(self._slice_names)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Shared metrics disabled: {e}")
+        
         # Start statistics collection thread
         self.monitor_thread = hub.spawn(self._monitor_loop)
         
@@ -212,23 +322,19 @@ class SlicingController(app_manager.RyuApp):
         ofproto = datapath.ofproto
         parser = datapath.ofproto_parser
         
-        for port, config in self.SLICE_CONFIG.items():
-            # Match UDP traffic to specific port
-            match = parser.OFPMatch(
-                eth_type=0x0800,      # IPv4
-                ip_proto=17,          # UDP
-                udp_dst=port
-            )
+        for port, tpl in self._slice_templates.items():
+            # Match UDP (IPv4, ip_proto=17) traffic to the slice port
+            match = parser.OFPMatch(**tpl['match_kwargs'])
             
             # Actions: Set DSCP, apply meter, output (will be set on packet-in)
             # DSCP is in the upper 6 bits of IP ToS field
             actions = [
-                parser.OFPActionSetField(ip_dscp=config['dscp'])
+                parser.OFPActionSetField(ip_dscp=tpl['dscp'])
             ]
             
             # Install with meter instruction
             inst = [
-                parser.OFPInstructionMeter(config['meter_id']),
+                parser.OFPInstructionMeter(tpl['meter_id']),
                 parser.OFPInstructionActions(
                     ofproto.OFPIT_APPLY_ACTIONS, actions
                 ),
@@ -238,7 +344,7 @@ class SlicingController(app_manager.RyuApp):
             # Create flow mod with instructions
             mod = parser.OFPFlowMod(
                 datapath=datapath,
-                priority=config['priority'],
+                priority=tpl['priority'],
                 match=match,
                 instructions=inst,
                 table_id=0
@@ -246,7 +352,7 @@ class SlicingController(app_manager.RyuApp):
             datapath.send_msg(mod)
             
             logger.info(f"  Installed slice rule: port {port} -> "
-                       f"{config['name']} (DSCP={config['dscp']})")
+                       f"{tpl['name']} (DSCP={tpl['dscp']})")
 
     def _add_flow(self, datapath, priority, match, actions, 
                   idle_timeout=0, hard_timeout=0, table_id=0):
@@ -297,20 +403,16 @@ class SlicingController(app_manager.RyuApp):
         dpid = datapath.id
         in_port = msg.match['in_port']
         
-        # Parse packet
-        pkt = packet.Packet(msg.data)
-        eth = pkt.get_protocol(ethernet.ethernet)
-        
-        if eth is None:
+        # Parse only the header fields we need; full parse for unusual frames
+        fields = _fast_classify(msg.data) or _full_classify(msg.data)
+        if fields is None:
             return
+        dst, src, ethertype, udp_dst = fields
         
         # Ignore LLDP
-        if eth.ethertype == 0x88cc:
+        if ethertype == 0x88cc:
             return
         
-        src = eth.src
-        dst = eth.dst
-        
         # Initialize MAC table for this switch
         self.mac_to_port.setdefault(dpid, {})
         
@@ -327,19 +429,19 @@ class SlicingController(app_manager.RyuApp):
         
         # Install flow for known destination (avoid controller overhead)
         if out_port != ofproto.OFPP_FLOOD:
-            # Check if this is slice traffic
-            ipv4_pkt = pkt.get_protocol(ipv4.ipv4)
-            udp_pkt = pkt.get_protocol(udp.udp)
-            
-            if ipv4_pkt and udp_pkt:
-                dst_port = udp_pkt.dst_port
+            # Check if this is slice traffic (IPv4/UDP)
+            if udp_dst is not None:
+                dst_port = udp_dst
                 if dst_port in self.SLICE_CONFIG:
                     config = self.SLICE_CONFIG[dst_port]
                     # Add DSCP marking for slice traffic
-                    actions = [
-                        parser.OFPActionSetField(ip_dscp=config['dscp']),
-                        parser.OFPActionOutput(out_port)
-                    ]
+                    key = (config['dscp'], out_port)
+                    actions = self._action_cache.get(key)
+                    if actions is None:
+                        actions = self._action_cache.setdefault(key, [
+                            parser.OFPActionSetField(ip_dscp=config['dscp']),
+                            parser.OFPActionOutput(out_port)
+                        ])
                     match = parser.OFPMatch(
                         in_port=in_port,
                         eth_dst=dst,
@@ -387,54 +489,48 @@ class SlicingController(app_manager.RyuApp):
         current_time = time.time()
         time_delta = current_time - self.prev_time
         
-        # Aggregate stats per slice
-        slice_stats = {
-            'URLLC': {'bytes': 0, 'packets': 0},
-            'eMBB': {'bytes': 0, 'packets': 0},
-            'mMTC': {'bytes': 0, 'packets': 0}
-        }
+        # Aggregate stats per slice (indexed like self._slice_names)
+        bytes_per_slice = [0] * len(self._slice_names)
+        pkts_per_slice = [0] * len(self._slice_names)
+        port_to_idx = self._port_to_slice_idx
         
         for stat in body:
-            # Check if this is a slice flow (by UDP port match)
-            if 'udp_dst' in stat.match:
-                udp_dst = stat.match['udp_dst']
-                if udp_dst in self.SLICE_CONFIG:
-                    slice_name = self.SLICE_CONFIG[udp_dst]['name']
-                    slice_stats[slice_name]['bytes'] += stat.byte_count
-                    slice_stats[slice_name]['packets'] += stat.packet_count
-        
-        # Calculate bandwidth and update metrics
-        for slice_name, stats in slice_stats.items():
-            current_bytes = stats['bytes']
-            prev_bytes = self.prev_stats.get(slice_name, {}).get('bytes', 0)
-            
-            # Calculate bandwidth in Mbps
-            if time_delta > 0:
-                byte_delta = current_bytes - prev_bytes
-                bandwidth_mbps = (byte_delta * 8) / (time_delta * 1000000)
-                bandwidth_mbps = max(0, bandwidth_mbps)  # Ensure non-negative
-            else:
-                bandwidth_mbps = 0
-            
-            # Update metrics
-            self.metrics[slice_name] = {
-                'bytes': current_bytes,
-                'packets': stats['packets'],
-                'bandwidth_mbps': round(bandwidth_mbps, 3)
-            }
+            # Slice flows are identified by their UDP destination port
+            idx = port_to_idx.get(stat.match.get('udp_dst'))
+            if idx is not None:
+                bytes_per_slice[idx] += stat.byte_count
+                pkts_per_slice[idx] += stat.packet_count
+        
+        # Calculate bandwidth in Mbps for all slices at once
+        # (clamped at 0 so counter resets never produce negative bandwidth)
+        current_bytes = np.array(bytes_per_slice, dtype=np.int64)
+        delta_bytes = np.maximum(0, current_bytes - self._prev_bytes)
+        if time_delta > 0:
+            bandwidth = np.round(delta_bytes * 8 / (time_delta * 1e6), 3)
+        else:
+            bandwidth = np.zeros(len(self._slice_names))
+        
+        # Update metrics (current bytes also serve as the next interval's baseline)
+        self._bytes = current_bytes
+        self._pkts = np.array(pkts_per_slice, dtype=np.int64)
+        self._bw = bandwidth
         
         # Store current stats for next calculation
-        self.prev_stats = slice_stats.copy()
+        self._prev_bytes = current_bytes
         self.prev_time = current_time
         
+        # Hand the latest features to the predictor (traffic volume in KB)
+        if self._shared_metrics is not None:
+            self._shared_metrics.publish(bandwidth, delta_bytes / 1e3)
+        
         # Export metrics to JSON
         self._export_metrics()
         
         # Log summary
         logger.info(f"Flow stats (DPID={dpid}):")
-        for name, m in self.metrics.items():
-            logger.info(f"  {name}: {m['bandwidth_mbps']:.2f} Mbps, "
-                       f"{m['packets']} pkts, {m['bytes']} bytes")
+        for name, bw, pkts, nbytes in zip(self._slice_names, self._bw.tolist(),
+                                          self._pkts.tolist(), self._bytes.tolist()):
+            logger.info(f"  {name}: {bw:.2f} Mbps, {pkts} pkts, {nbytes} bytes")
 
     def _export_metrics(self):
         """
@@ -445,23 +541,42 @@ class SlicingController(app_manager.RyuApp):
         timestamp = datetime.utcnow().isoformat() + 'Z'
         
         metrics_records = []
-        for slice_name, m in self.metrics.items():
+        for slice_name, bw, pkts, nbytes in zip(self._slice_names, self._bw.tolist(),
+                                                self._pkts.tolist(), self._bytes.tolist()):
             record = {
                 'timestamp': timestamp,
                 'slice_name': slice_name,
-                'bandwidth_mbps': m['bandwidth_mbps'],
-                'packets': m['packets'],
-                'bytes': m['bytes'],
+                'bandwidth_mbps': bw,
+                'packets': pkts,
+                'bytes': nbytes,
                 'controller': 'ryu-slicing',
                 'type': 'flow_stats'
             }
             metrics_records.append(record)
         
-        # Write to JSON file (append mode for Logstash file input)
-        metrics_file = self.metrics_dir / 'flow_metrics.json'
-        with open(metrics_file, 'a') as f:
-            for record in metrics_records:
-                f.write(json.dumps(record) + '\n')
+        # Append to JSON file (newline-delimited for Logstash file input)
+        if orjson is not None:
+            buf = b'\n'.join(orjson.dumps(r) for r in metrics_records) + b'\n'
+        else:
+            buf = ''.join(json.dumps(r) + '\n' for r in metrics_records).encode()
+        os.write(self._metrics_fd, buf)
+        self._metrics_bytes += len(buf)
+        if self._metrics_bytes > self.METRICS_MAX_BYTES:
+            self._rotate_metrics_file()
+
+    def _open_metrics_file(self):
+        """Open the metrics file for appending and record its current size."""
+        self._metrics_fd = os.open(self._metrics_path,
+                                   os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._metrics_bytes = os.fstat(self._metrics_fd).st_size
+
+    def _rotate_metrics_file(self):
+        """Move the full metrics file to <file>.1 (replacing the previous one) and start a new one."""
+        os.close(self._metrics_fd)
+        archive = self._metrics_path.with_name(self._metrics_path.name + '.1')
+        os.replace(self._metrics_path, archive)
+        self._open_metrics_file()
+        logger.info(f"Rotated metrics file to {archive}")
 
     def get_metrics(self):
         """
@@ -470,7 +585,11 @@ class SlicingController(app_manager.RyuApp):
         Returns:
             dict: Current metrics per slice
         """
-        return self.metrics.copy()
+        return {
+            name: {'bytes': nbytes, 'packets': pkts, 'bandwidth_mbps': bw}
+            for name, nbytes, pkts, bw in zip(self._slice_names, self._bytes.tolist(),
+                                              self._pkts.tolist(), self._bw.tolist())
+        }
 
 
 # Entry point for Ryu application
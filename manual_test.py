@@ -11,6 +11,17 @@ import subprocess
 import sys
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Optional: query processes and links in-process instead of spawning shell tools
+try:
+    import psutil
+except ImportError:
+    psutil = None
+try:
+    from pyroute2 import IPRoute
+except ImportError:
+    IPRoute = None
 
 # Colors
 RED = '\033[0;31m'
@@ -53,6 +64,51 @@ def run_mn_cmd(host, cmd):
     except:
         return "Command failed or timed out"
 
+def process_running(pattern):
+    """Check whether any process command line contains pattern."""
+    if psutil is None:
+        return subprocess.run(f"pgrep -f '{pattern}'", shell=True,
+                              capture_output=True).returncode == 0
+    for proc in psutil.process_iter(['cmdline']):
+        if proc.pid != os.getpid() and pattern in ' '.join(proc.info['cmdline'] or ()):
+            return True
+    return False
+
+def count_netns_processes(netns, name):
+    """Count processes called name running inside network namespace netns."""
+    if psutil is None:
+        result = subprocess.run(f"sudo ip netns exec {netns} pgrep {name} 2>/dev/null",
+                                shell=True, capture_output=True, text=True)
+        return len(result.stdout.split())
+    try:
+        ns = os.stat(f"/var/run/netns/{netns}")
+    except OSError:
+        return 0
+    count = 0
+    for proc in psutil.process_iter(['pid', 'name']):
+        if proc.info['name'] != name:
+            continue
+        try:
+            proc_ns = os.stat(f"/proc/{proc.info['pid']}/ns/net")
+        except OSError:
+            continue
+        if (proc_ns.st_dev, proc_ns.st_ino) == (ns.st_dev, ns.st_ino):
+            count += 1
+    return count
+
+def count_ovs_bridges():
+    """Count Open vSwitch bridges (the datapath's ovs-system port is not a switch)."""
+    if IPRoute is None:
+        result = subprocess.run("sudo ovs-vsctl show 2>/dev/null | grep Bridge",
+                                shell=True, capture_output=True, text=True)
+        return result.stdout.count("Bridge")
+    with IPRoute() as ipr:
+        return sum(
+            1 for link in ipr.get_links()
+            if link.get_nested('IFLA_LINKINFO', 'IFLA_INFO_KIND') == 'openvswitch'
+            and link.get_attr('IFLA_IFNAME') != 'ovs-system'
+        )
+
 def test_connectivity():
     """Test connectivity between all hosts."""
     print(f"{YELLOW}Testing connectivity...{NC}")
@@ -64,18 +120,33 @@ def test_connectivity():
         ("server", "10.0.0.100")
     ]
     
-    for src_name, src_ip in hosts:
-        for dst_name, dst_ip in hosts:
-            if src_name != dst_name:
-                cmd = f"ping -c 1 -W 1 {dst_ip}"
-                result = subprocess.run(
-                    f"sudo ip netns exec mn_{src_name} {cmd}",
-                    shell=True, capture_output=True, text=True
-                )
-                if "1 received" in result.stdout:
-                    print(f"  {GREEN}✓{NC} {src_name} -> {dst_name}")
-                else:
-                    print(f"  {RED}✗{NC} {src_name} -> {dst_name}")
+    pairs = [
+        (src_name, dst_name, dst_ip)
+        for src_name, _ in hosts
+        for dst_name, dst_ip in hosts
+        if src_name != dst_name
+    ]
+    
+    def ping(src_name, dst_ip):
+        # ping exits 0 only when a reply was received
+        result = subprocess.run(
+            f"sudo ip netns exec mn_{src_name} ping -c 1 -W 1 {dst_ip}",
+            shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        return result.returncode == 0
+    
+    # Pings are independent and wait on the network, so run them all at once
+    with ThreadPoolExecutor(max_workers=len(pairs)) as executor:
+        futures = {
+            executor.submit(ping, src_name, dst_ip): (src_name, dst_name)
+            for src_name, dst_name, dst_ip in pairs
+        }
+        for future in as_completed(futures):
+            src_name, dst_name = futures[future]
+            if future.result():
+                print(f"  {GREEN}✓{NC} {src_name} -> {dst_name}")
+            else:
+                print(f"  {RED}✗{NC} {src_name} -> {dst_name}")
 
 def start_iperf_servers():
     """Start iperf3 servers on the server host."""
@@ -89,8 +160,7 @@ def start_iperf_servers():
     subprocess.run("sudo ip netns exec mn_server iperf3 -s -p 5003 -D", shell=True)
     
     time.sleep(1)
-    result = subprocess.run("sudo ip netns exec mn_server pgrep iperf3", shell=True, capture_output=True, text=True)
-    if result.stdout.strip():
+    if count_netns_processes("mn_server", "iperf3"):
         print(f"{GREEN}✓ iperf3 servers running{NC}")
     else:
         print(f"{RED}✗ Failed to start iperf3 servers{NC}")
@@ -135,27 +205,23 @@ def show_status():
     print(f"{YELLOW}Network Status:{NC}")
     
     # Check controller
-    result = subprocess.run("pgrep -f ryu-manager", shell=True, capture_output=True)
-    if result.returncode == 0:
+    if process_running("ryu-manager"):
         print(f"  {GREEN}✓{NC} Ryu Controller running")
     else:
         print(f"  {RED}✗{NC} Ryu Controller not running")
     
     # Check Mininet
-    result = subprocess.run("pgrep -f 'python3 topology.py'", shell=True, capture_output=True)
-    if result.returncode == 0:
+    if process_running("python3 topology.py"):
         print(f"  {GREEN}✓{NC} Mininet running")
     else:
         print(f"  {RED}✗{NC} Mininet not running")
     
     # Check switches
-    result = subprocess.run("sudo ovs-vsctl show 2>/dev/null | grep Bridge", shell=True, capture_output=True, text=True)
-    switches = result.stdout.count("Bridge")
+    switches = count_ovs_bridges()
     print(f"  {GREEN}✓{NC} {switches} OVS switches found")
     
     # Check iperf3 servers
-    result = subprocess.run("sudo ip netns exec mn_server pgrep iperf3 2>/dev/null", shell=True, capture_output=True, text=True)
-    servers = len(result.stdout.strip().split('\n')) if result.stdout.strip() else 0
+    servers = count_netns_processes("mn_server", "iperf3")
     print(f"  {GREEN}✓{NC} {servers} iperf3 servers running")
 
 def stop_traffic():
@@ -10,10 +10,39 @@ import json
 import time
 import os
 import sys
+import signal
+from types import MappingProxyType
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
 import threading
 
+try:
+    import orjson
+except ImportError:  # Fall back to compact stdlib json
+    orjson = None
+
+
+def _json_line(obj):
+    """Encode obj as one compact JSON line (bytes)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, separators=(',', ':')) + '\n').encode()
+
+# (second, 'YYYY-mm-ddTHH:MM:SS.') for the last second _iso_now() formatted
+_iso_second = (None, '')
+
+def _iso_now():
+    """Local time as an ISO 8601 string with microseconds, like datetime.now().isoformat()."""
+    global _iso_second
+    ns = time.time_ns()
+    second, prefix = _iso_second
+    if ns // 1_000_000_000 != second:
+        # Date and time fields change at most once a second: format them once
+        second = ns // 1_000_000_000
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S.', time.localtime(second))
+        _iso_second = (second, prefix)
+    return '%s%06d' % (prefix, ns // 1000 % 1_000_000)
+
 # ANSI colors for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -28,41 +57,209 @@ class Colors:
 class SimpleMonitor:
     """Simple real-time monitoring for 5G network slices."""
     
+    # SLA thresholds (read-only, shared by all instances)
+    SLA_THRESHOLDS = MappingProxyType({
+        'urllc': {'bandwidth': 50, 'latency': 1, 'jitter': 0.1, 'packet_loss': 0.001},
+        'embb': {'bandwidth': 100, 'latency': 10, 'jitter': 2, 'packet_loss': 0.01},
+        'mmtc': {'bandwidth': 1, 'latency': 100, 'jitter': 10, 'packet_loss': 0.1}
+    })
+    
+    # Same limits as (min_bandwidth, max_latency, max_jitter, max_packet_loss) tuples
+    # for _check_sla()
+    _SLA_LIMITS = {
+        name: (t['bandwidth'], t['latency'], t['jitter'], t['packet_loss'])
+        for name, t in SLA_THRESHOLDS.items()
+    }
+    
+    # Limits for a slice without thresholds (only packet loss above 100% violates)
+    _NO_SLA_LIMITS = (0, float('inf'), float('inf'), 1)
+    
+    # Demo mode value ranges per slice: (bandwidth, latency, jitter, packet_loss)
+    _DEMO_RANGES = {
+        'urllc': ((45, 60), (0.5, 1.5), (0.05, 0.15), (0, 0.002)),
+        'embb': ((80, 120), (5, 15), (1, 3), (0, 0.02)),
+        'mmtc': ((0.5, 2), (50, 150), (5, 15), (0, 0.15))
+    }
+    
+    # Per-slice history files are JSON Lines, appended through a buffered handle
+    HISTORY_LENGTH = 100       # Samples kept in memory (ring buffer) / loaded back per slice
+    METRICS_FLUSH_EVERY = 20   # Flush a history file at least every N records
+    METRICS_MAX_BYTES = 8 * 1024 * 1024  # Rotate a history file to <file>.1 past this size
+    REFRESH_INTERVAL_S = 2     # Dashboard tick period in demo and live mode
+    
+    # Static parts of the HTML report, built once
+    _HTML_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+    <title>5G Network Slicing Report</title>
+    <meta http-equiv="refresh" content="2">
+    <style>
+        body { font-family: Arial, sans-serif; background: #1a1a2e; color: #eee; padding: 20px; }
+        .container { max-width: 1200px; margin: 0 auto; }
+        h1 { color: #00d9ff; text-align: center; }
+        .slice-card { background: #16213e; border-radius: 10px; padding: 20px; margin: 20px 0; }
+        .slice-header { display: flex; justify-content: space-between; align-items: center; }
+        .slice-name { font-size: 1.5em; color: #00d9ff; }
+        .status-ok { color: #00ff88; }
+        .status-warn { color: #ffaa00; }
+        .status-error { color: #ff4444; }
+        .metrics { display: grid; grid-template-columns: repeat(4, 1fr); gap: 15px; margin-top: 15px; }
+        .metric { background: #0f3460; padding: 15px; border-radius: 8px; text-align: center; }
+        .metric-value { font-size: 2em; font-weight: bold; }
+        .metric-label { color: #888; font-size: 0.9em; }
+        .bar { height: 8px; background: #333; border-radius: 4px; margin-top: 10px; }
+        .bar-fill { height: 100%; border-radius: 4px; }
+        .timestamp { text-align: center; color: #666; margin-top: 30px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>🛜 5G Network Slicing Dashboard</h1>
+"""
+    
+    # Per-slice card fields, in order: name, status class, status text,
+    # bandwidth, latency, jitter, packet loss (%)
+    _HTML_SLICE = """
+        <div class="slice-card">
+            <div class="slice-header">
+                <span class="slice-name">{}</span>
+                <span class="{}">{}</span>
+            </div>
+            <div class="metrics">
+                <div class="metric">
+                    <div class="metric-value" style="color: #00d9ff;">{:.2f}</div>
+                    <div class="metric-label">Bandwidth (Mbps)</div>
+                </div>
+                <div class="metric">
+                    <div class="metric-value" style="color: #ffaa00;">{:.2f}</div>
+                    <div class="metric-label">Latency (ms)</div>
+                </div>
+                <div class="metric">
+                    <div class="metric-value" style="color: #aa88ff;">{:.3f}</div>
+                    <div class="metric-label">Jitter (ms)</div>
+                </div>
+                <div class="metric">
+                    <div class="metric-value" style="color: #ff6688;">{:.4f}</div>
+                    <div class="metric-label">Packet Loss (%)</div>
+                </div>
+            </div>
+        </div>
+"""
+    
+    _HTML_FOOTER = """
+        <div class="timestamp">Last updated: {}</div>
+    </div>
+</body>
+</html>
+"""
+    
+    _HTML_SLICE_NAMES = {
+        'urllc': 'URLLC - Ultra-Reliable Low Latency',
+        'embb': 'eMBB - Enhanced Mobile Broadband', 
+        'mmtc': 'mMTC - Massive Machine Type Communications'
+    }
+    
+    # Whole report as one template: CSS braces escaped, then the card fields
+    # for each slice and the update time
+    _HTML_REPORT = ''.join([
+        _HTML_HEADER.replace('{', '{{').replace('}', '}}'),
+        _HTML_SLICE * 3,
+        _HTML_FOOTER
+    ])
+    
+    # Every possible bar of the default width, indexed by filled cells
+    _BAR_WIDTH = 30
+    _BARS = tuple('█' * i + '░' * (30 - i) for i in range(31))
+    _BAR_COLORS = (Colors.RED, Colors.YELLOW, Colors.GREEN)
+    
+    # ANSI erase display + cursor home (no clear/cls subprocess per frame)
+    _CLEAR_SCREEN = "\033[2J\033[H"
+    
+    # Static parts of the terminal dashboard
+    _DASH_HEADER = '\n'.join([
+        f"{Colors.BOLD}{Colors.CYAN}",
+        "=" * 80,
+        "        5G NETWORK SLICING - REAL-TIME MONITORING DASHBOARD",
+        "=" * 80,
+        f"{Colors.ENDC}"
+    ])
+    _DASH_BOX_TOP = f"{Colors.BOLD}┌{'─' * 78}┐{Colors.ENDC}"
+    _DASH_BOX_SEP = f"{Colors.BOLD}├{'─' * 78}┤{Colors.ENDC}"
+    _DASH_BOX_BOTTOM = f"└{'─' * 78}┘"
+    _DASH_VIOLATIONS = f"│  {Colors.RED}SLA Violations:{Colors.ENDC}                                                      │"
+    _DASH_WAITING = f"│  {Colors.YELLOW}Waiting for metrics...{Colors.ENDC}                                               │"
+    _DASH_SLICE_NAMES = {
+        'urllc': 'URLLC (Ultra-Reliable Low Latency)',
+        'embb': 'eMBB (Enhanced Mobile Broadband)',
+        'mmtc': 'mMTC (Massive Machine Type Comm.)'
+    }
+    
     def __init__(self, metrics_dir="monitoring/metrics"):
         self.metrics_dir = metrics_dir
-        self.slice_metrics = defaultdict(list)
+        self.slice_metrics = defaultdict(lambda: deque(maxlen=self.HISTORY_LENGTH))
         self.running = False
+        self._stop = threading.Event()
         
-        # SLA thresholds
-        self.sla_thresholds = {
-            'urllc': {'bandwidth': 50, 'latency': 1, 'jitter': 0.1, 'packet_loss': 0.001},
-            'embb': {'bandwidth': 100, 'latency': 10, 'jitter': 2, 'packet_loss': 0.01},
-            'mmtc': {'bandwidth': 1, 'latency': 100, 'jitter': 10, 'packet_loss': 0.1}
-        }
+        self.sla_thresholds = self.SLA_THRESHOLDS
+        
+        # Open append handles for {slice}_metrics.jsonl, and records written since last flush
+        self._metric_files = {}
+        self._unflushed = defaultdict(int)
+        
+        # Set when history changed since the last render; (mtime_ns, size) of
+        # each history file as last loaded, and (inode, offset) read up to
+        self._dirty = True
+        self._file_stats = {}
+        self._file_offsets = {}
+        
+        # Demo mode render handoff: the sampler stores the latest tick's display
+        # time in a single slot and wakes the render thread, which skips
+        # intermediate ticks if rendering falls behind
+        self._render_time = None
+        self._render_ready = threading.Event()
         
         os.makedirs(metrics_dir, exist_ok=True)
         os.makedirs("monitoring/reports", exist_ok=True)
+        
+        if os.name == 'nt':
+            os.system('')  # Enables ANSI escape processing in the Windows console
+    
+    def stop(self):
+        """Stop a running demo/live loop (from another thread or a signal handler)."""
+        self.running = False
+        self._stop.set()
     
     def clear_screen(self):
         """Clear terminal screen."""
-        os.system('clear' if os.name != 'nt' else 'cls')
+        sys.stdout.write(self._CLEAR_SCREEN)
+        sys.stdout.flush()
     
     def check_sla(self, slice_type, metrics):
         """Check if metrics meet SLA requirements."""
+        return self._check_sla(slice_type, metrics.get('bandwidth', 0), metrics.get('latency', 0),
+                               metrics.get('jitter', 0), metrics.get('packet_loss', 0))
+    
+    def _check_sla(self, slice_type, bandwidth, latency, jitter, packet_loss):
+        """check_sla() on metric values already read from the record."""
         violations = []
-        thresholds = self.sla_thresholds.get(slice_type, {})
+        min_bw, max_lat, max_jit, max_loss = self._SLA_LIMITS.get(slice_type, self._NO_SLA_LIMITS)
         
-        if metrics.get('bandwidth', 0) < thresholds.get('bandwidth', 0):
-            violations.append(f"Bandwidth: {metrics.get('bandwidth', 0):.2f} < {thresholds['bandwidth']} Mbps")
-        if metrics.get('latency', 0) > thresholds.get('latency', float('inf')):
-            violations.append(f"Latency: {metrics.get('latency', 0):.2f} > {thresholds['latency']} ms")
-        if metrics.get('jitter', 0) > thresholds.get('jitter', float('inf')):
-            violations.append(f"Jitter: {metrics.get('jitter', 0):.3f} > {thresholds['jitter']} ms")
-        if metrics.get('packet_loss', 0) > thresholds.get('packet_loss', 1):
-            violations.append(f"Packet Loss: {metrics.get('packet_loss', 0)*100:.3f}% > {thresholds['packet_loss']*100}%")
+        if bandwidth < min_bw:
+            violations.append(f"Bandwidth: {bandwidth:.2f} < {min_bw} Mbps")
+        if latency > max_lat:
+            violations.append(f"Latency: {latency:.2f} > {max_lat} ms")
+        if jitter > max_jit:
+            violations.append(f"Jitter: {jitter:.3f} > {max_jit} ms")
+        if packet_loss > max_loss:
+            violations.append(f"Packet Loss: {packet_loss*100:.3f}% > {max_loss*100}%")
         
         return violations
     
+    def _count_violations(self, slice_type, bandwidth, latency, jitter, packet_loss):
+        """Number of SLA violations, without building _check_sla()'s messages."""
+        min_bw, max_lat, max_jit, max_loss = self._SLA_LIMITS.get(slice_type, self._NO_SLA_LIMITS)
+        return (bandwidth < min_bw) + (latency > max_lat) + (jitter > max_jit) + (packet_loss > max_loss)
+    
     def get_status_color(self, violations):
         """Get color based on SLA status."""
         if not violations:
@@ -71,58 +268,63 @@ class SimpleMonitor:
             return Colors.YELLOW
         return Colors.RED
     
-    def display_dashboard(self):
-        """Display real-time dashboard in terminal."""
-        self.clear_screen()
+    def display_dashboard(self, display_time=None):
+        """Display real-time dashboard in terminal (display_time: 'YYYY-mm-dd HH:MM:SS', default now)."""
+        if display_time is None:
+            display_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        print(f"{Colors.BOLD}{Colors.CYAN}")
-        print("=" * 80)
-        print("        5G NETWORK SLICING - REAL-TIME MONITORING DASHBOARD")
-        print("=" * 80)
-        print(f"{Colors.ENDC}")
-        print(f"  Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"  Press Ctrl+C to stop monitoring")
-        print()
+        # Build the whole frame (starting with a screen clear), then write it
+        # to the terminal at once
+        lines = [self._CLEAR_SCREEN + self._DASH_HEADER,
+                 f"  Time: {display_time}",
+                 "  Press Ctrl+C to stop monitoring",
+                 ""]
         
         for slice_type in ['urllc', 'embb', 'mmtc']:
             metrics = self.slice_metrics.get(slice_type, [{}])[-1] if self.slice_metrics.get(slice_type) else {}
-            violations = self.check_sla(slice_type, metrics)
+            bw = metrics.get('bandwidth', 0)
+            lat = metrics.get('latency', 0)
+            jit = metrics.get('jitter', 0)
+            loss = metrics.get('packet_loss', 0)
+            violations = self._check_sla(slice_type, bw, lat, jit, loss)
             status_color = self.get_status_color(violations)
             status = "✓ OK" if not violations else f"✗ {len(violations)} VIOLATION(S)"
             
             # Slice header
-            slice_names = {'urllc': 'URLLC (Ultra-Reliable Low Latency)', 
-                          'embb': 'eMBB (Enhanced Mobile Broadband)',
-                          'mmtc': 'mMTC (Massive Machine Type Comm.)'}
-            
-            print(f"{Colors.BOLD}┌{'─' * 78}┐{Colors.ENDC}")
-            print(f"{Colors.BOLD}│ {slice_names.get(slice_type, slice_type):40} {status_color}{status:>35}{Colors.ENDC} │")
-            print(f"{Colors.BOLD}├{'─' * 78}┤{Colors.ENDC}")
+            lines.append(self._DASH_BOX_TOP)
+            lines.append(f"{Colors.BOLD}│ {self._DASH_SLICE_NAMES.get(slice_type, slice_type):40} {status_color}{status:>35}{Colors.ENDC} │")
+            lines.append(self._DASH_BOX_SEP)
             
             if metrics:
-                bw = metrics.get('bandwidth', 0)
-                lat = metrics.get('latency', 0)
-                jit = metrics.get('jitter', 0)
-                pl = metrics.get('packet_loss', 0) * 100
+                pl = loss * 100
                 
                 # Create bar charts
                 bw_bar = self._create_bar(bw, self.sla_thresholds[slice_type]['bandwidth'] * 2)
                 lat_bar = self._create_bar(lat, self.sla_thresholds[slice_type]['latency'] * 2, reverse=True)
                 
-                print(f"│  Bandwidth:    {bw:8.2f} Mbps  {bw_bar:40} │")
-                print(f"│  Latency:      {lat:8.2f} ms    {lat_bar:40} │")
-                print(f"│  Jitter:       {jit:8.3f} ms                                              │")
-                print(f"│  Packet Loss:  {pl:8.4f} %                                              │")
+                lines.append(f"│  Bandwidth:    {bw:8.2f} Mbps  {bw_bar:40} │")
+                lines.append(f"│  Latency:      {lat:8.2f} ms    {lat_bar:40} │")
+                lines.append(f"│  Jitter:       {jit:8.3f} ms                                              │")
+                lines.append(f"│  Packet Loss:  {pl:8.4f} %                                              │")
                 
                 if violations:
-                    print(f"│  {Colors.RED}SLA Violations:{Colors.ENDC}                                                      │")
+                    lines.append(self._DASH_VIOLATIONS)
                     for v in violations:
-                        print(f"│    {Colors.RED}• {v:70}{Colors.ENDC} │")
+                        lines.append(f"│    {Colors.RED}• {v:70}{Colors.ENDC} │")
             else:
-                print(f"│  {Colors.YELLOW}Waiting for metrics...{Colors.ENDC}                                               │")
+                lines.append(self._DASH_WAITING)
             
-            print(f"└{'─' * 78}┘")
-            print()
+            lines.append(self._DASH_BOX_BOTTOM)
+            lines.append("")
+        
+        frame = '\n'.join(lines) + '\n'
+        out = sys.stdout
+        if hasattr(out, 'buffer'):
+            out.flush()
+            out.buffer.write(frame.encode(out.encoding or 'utf-8', errors='replace'))
+            out.buffer.flush()
+        else:
+            out.write(frame)
     
     def _create_bar(self, value, max_val, width=30, reverse=False):
         """Create ASCII progress bar."""
@@ -132,31 +334,19 @@ class SimpleMonitor:
             pct = min(value / max_val, 1.0)
         
         filled = int(width * pct)
-        empty = width - filled
-        
-        if reverse:
-            # For latency: lower is better
-            if pct < 0.3:
-                color = Colors.GREEN
-            elif pct < 0.7:
-                color = Colors.YELLOW
-            else:
-                color = Colors.RED
+        if width == self._BAR_WIDTH and 0 <= filled <= width:
+            bar = self._BARS[filled]
         else:
-            # For bandwidth: higher is better
-            if pct > 0.7:
-                color = Colors.GREEN
-            elif pct > 0.3:
-                color = Colors.YELLOW
-            else:
-                color = Colors.RED
+            bar = '█' * filled + '░' * (width - filled)
         
-        return f"{color}{'█' * filled}{'░' * empty}{Colors.ENDC}"
+        # Bandwidth: higher is better; latency (reverse): lower is better
+        level = (pct > 0.3) + (pct > 0.7) if not reverse else (pct < 0.7) + (pct < 0.3)
+        return f"{self._BAR_COLORS[level]}{bar}{Colors.ENDC}"
     
-    def record_metrics(self, slice_type, bandwidth, latency, jitter, packet_loss):
-        """Record metrics for a slice."""
+    def record_metrics(self, slice_type, bandwidth, latency, jitter, packet_loss, timestamp=None):
+        """Record metrics for a slice (timestamp: ISO string shared by a tick, default now)."""
         metrics = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp or _iso_now(),
             'slice_type': slice_type,
             'bandwidth': bandwidth,
             'latency': latency,
@@ -164,119 +354,138 @@ class SimpleMonitor:
             'packet_loss': packet_loss
         }
         
+        # Bounded history: the oldest sample is evicted past HISTORY_LENGTH
         self.slice_metrics[slice_type].append(metrics)
+        self._dirty = True
         
-        # Keep only last 100 metrics per slice
-        if len(self.slice_metrics[slice_type]) > 100:
-            self.slice_metrics[slice_type] = self.slice_metrics[slice_type][-100:]
-        
-        # Save to file
-        metrics_file = os.path.join(self.metrics_dir, f"{slice_type}_metrics.json")
-        with open(metrics_file, 'w') as f:
-            json.dump(self.slice_metrics[slice_type], f, indent=2)
+        # Append to file (one JSON object per line)
+        fh = self._metric_files.get(slice_type)
+        if fh is None:
+            fh = self._metric_files[slice_type] = open(
+                self._metrics_path(slice_type), 'ab', buffering=64 * 1024)
+        fh.write(_json_line(metrics))
+        self._unflushed[slice_type] += 1
+        if self._unflushed[slice_type] >= self.METRICS_FLUSH_EVERY:
+            fh.flush()
+            self._unflushed[slice_type] = 0
+        if fh.tell() >= self.METRICS_MAX_BYTES:
+            self._rotate_metrics(slice_type)
+    
+    def _rotate_metrics(self, slice_type):
+        """Move a full history file to <file>.1 (replacing the previous one); the next record starts a new file."""
+        self._metric_files.pop(slice_type).close()
+        self._unflushed[slice_type] = 0
+        path = self._metrics_path(slice_type)
+        os.replace(path, path + '.1')
+    
+    def flush_metrics(self):
+        """Flush buffered metric records so other processes can read them."""
+        for slice_type, fh in self._metric_files.items():
+            if self._unflushed[slice_type]:
+                fh.flush()
+                self._unflushed[slice_type] = 0
+    
+    def close(self):
+        """Flush and close the metric history files."""
+        self.flush_metrics()
+        for fh in self._metric_files.values():
+            fh.close()
+        self._metric_files.clear()
+    
+    def _metrics_path(self, slice_type):
+        """Path of the JSON Lines history file for a slice."""
+        return os.path.join(self.metrics_dir, f"{slice_type}_metrics.jsonl")
     
     def load_metrics_from_files(self):
-        """Load metrics from JSON files."""
+        """Load metrics appended to the JSON Lines files since the last call."""
         for slice_type in ['urllc', 'embb', 'mmtc']:
-            metrics_file = os.path.join(self.metrics_dir, f"{slice_type}_metrics.json")
-            if os.path.exists(metrics_file):
+            metrics_file = self._metrics_path(slice_type)
+            try:
+                st = os.stat(metrics_file)
+            except OSError:
+                continue
+            file_stat = (st.st_mtime_ns, st.st_size)
+            if self._file_stats.get(slice_type) == file_stat:
+                continue
+            
+            # Files are append-only: resume after the last complete record read,
+            # or read the tail from the start if the file was replaced or truncated
+            inode, offset = self._file_offsets.get(slice_type, (None, 0))
+            if inode != st.st_ino or st.st_size < offset:
+                offset = 0
+            
+            try:
+                with open(metrics_file, 'rb') as f:
+                    f.seek(offset)
+                    lines = deque(f, maxlen=self.HISTORY_LENGTH)
+                    end = f.tell()
+            except OSError:
+                continue
+            
+            if lines and not lines[-1].endswith(b'\n'):
+                end -= len(lines.pop())  # Partially written last line, re-read next time
+            
+            if not offset and len(lines) < self.HISTORY_LENGTH:
+                # Recently rotated: fill the history up from the previous file
+                try:
+                    with open(metrics_file + '.1', 'rb') as f:
+                        lines.extendleft(reversed(deque(f, maxlen=self.HISTORY_LENGTH - len(lines))))
+                except OSError:
+                    pass
+            
+            history = self.slice_metrics[slice_type] if offset else deque(maxlen=self.HISTORY_LENGTH)
+            for line in lines:
                 try:
-                    with open(metrics_file, 'r') as f:
-                        self.slice_metrics[slice_type] = json.load(f)
-                except:
+                    history.append(json.loads(line))
+                except ValueError:
                     pass
+            self.slice_metrics[slice_type] = history
+            self._file_offsets[slice_type] = (st.st_ino, end)
+            self._file_stats[slice_type] = file_stat
+            self._dirty = True
     
-    def generate_html_report(self):
-        """Generate HTML report with metrics."""
-        html = """<!DOCTYPE html>
-<html>
-<head>
-    <title>5G Network Slicing Report</title>
-    <meta http-equiv="refresh" content="5">
-    <style>
-        body { font-family: Arial, sans-serif; background: #1a1a2e; color: #eee; padding: 20px; }
-        .container { max-width: 1200px; margin: 0 auto; }
-        h1 { color: #00d9ff; text-align: center; }
-        .slice-card { background: #16213e; border-radius: 10px; padding: 20px; margin: 20px 0; }
-        .slice-header { display: flex; justify-content: space-between; align-items: center; }
-        .slice-name { font-size: 1.5em; color: #00d9ff; }
-        .status-ok { color: #00ff88; }
-        .status-warn { color: #ffaa00; }
-        .status-error { color: #ff4444; }
-        .metrics { display: grid; grid-template-columns: repeat(4, 1fr); gap: 15px; margin-top: 15px; }
-        .metric { background: #0f3460; padding: 15px; border-radius: 8px; text-align: center; }
-        .metric-value { font-size: 2em; font-weight: bold; }
-        .metric-label { color: #888; font-size: 0.9em; }
-        .bar { height: 8px; background: #333; border-radius: 4px; margin-top: 10px; }
-        .bar-fill { height: 100%; border-radius: 4px; }
-        .timestamp { text-align: center; color: #666; margin-top: 30px; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🛜 5G Network Slicing Dashboard</h1>
-"""
-        
-        slice_names = {
-            'urllc': 'URLLC - Ultra-Reliable Low Latency',
-            'embb': 'eMBB - Enhanced Mobile Broadband', 
-            'mmtc': 'mMTC - Massive Machine Type Communications'
-        }
+    def generate_html_report(self, display_time=None):
+        """Generate HTML report with metrics (display_time as for display_dashboard)."""
+        values = []
         
         for slice_type in ['urllc', 'embb', 'mmtc']:
             metrics = self.slice_metrics.get(slice_type, [{}])[-1] if self.slice_metrics.get(slice_type) else {}
-            violations = self.check_sla(slice_type, metrics)
-            
-            status_class = "status-ok" if not violations else ("status-warn" if len(violations) <= 2 else "status-error")
-            status_text = "✓ SLA OK" if not violations else f"✗ {len(violations)} Violation(s)"
-            
             bw = metrics.get('bandwidth', 0)
             lat = metrics.get('latency', 0)
             jit = metrics.get('jitter', 0)
-            pl = metrics.get('packet_loss', 0) * 100
+            loss = metrics.get('packet_loss', 0)
+            # The report only shows how many SLAs are violated
+            num_violations = self._count_violations(slice_type, bw, lat, jit, loss)
             
-            html += f"""
-        <div class="slice-card">
-            <div class="slice-header">
-                <span class="slice-name">{slice_names[slice_type]}</span>
-                <span class="{status_class}">{status_text}</span>
-            </div>
-            <div class="metrics">
-                <div class="metric">
-                    <div class="metric-value" style="color: #00d9ff;">{bw:.2f}</div>
-                    <div class="metric-label">Bandwidth (Mbps)</div>
-                </div>
-                <div class="metric">
-                    <div class="metric-value" style="color: #ffaa00;">{lat:.2f}</div>
-                    <div class="metric-label">Latency (ms)</div>
-                </div>
-                <div class="metric">
-                    <div class="metric-value" style="color: #aa88ff;">{jit:.3f}</div>
-                    <div class="metric-label">Jitter (ms)</div>
-                </div>
-                <div class="metric">
-                    <div class="metric-value" style="color: #ff6688;">{pl:.4f}</div>
-                    <div class="metric-label">Packet Loss (%)</div>
-                </div>
-            </div>
-        </div>
-"""
+            status_class = "status-ok" if not num_violations else ("status-warn" if num_violations <= 2 else "status-error")
+            status_text = "✓ SLA OK" if not num_violations else f"✗ {num_violations} Violation(s)"
+            
+            values += (self._HTML_SLICE_NAMES[slice_type], status_class, status_text,
+                       bw, lat, jit, loss * 100)
         
-        html += f"""
-        <div class="timestamp">Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>
-    </div>
-</body>
-</html>
-"""
+        if display_time is None:
+            display_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        values.append(display_time)
+        html = self._HTML_REPORT.format(*values)
         
+        # Write to a temp file and rename over the report, so a refreshing
+        # browser never reads a half-written page
         report_path = "monitoring/reports/dashboard.html"
-        with open(report_path, 'w') as f:
-            f.write(html)
+        tmp_path = report_path + ".tmp"
+        with open(tmp_path, 'wb', buffering=64 * 1024) as f:
+            f.write(html.encode('utf-8'))
+        os.replace(tmp_path, report_path)
         
         return report_path
     
-    def run_demo(self):
-        """Run with simulated metrics for demonstration."""
+    def run_demo(self, samples_per_tick=1):
+        """
+        Run with simulated metrics for demonstration.
+        
+        Args:
+            samples_per_tick: Samples recorded per slice every refresh; raise
+                it to use the demo as a load generator for the history files
+        """
         import random
         
         print(f"{Colors.CYAN}Starting demo mode with simulated metrics...{Colors.ENDC}")
@@ -284,37 +493,70 @@ class SimpleMonitor:
         time.sleep(2)
         
         self.running = True
+        uniform = random.Random().uniform
+        demo_ranges = tuple(self._DEMO_RANGES.items())
+        
+        # Dashboard and HTML report are rendered off the sampling thread
+        renderer = threading.Thread(target=self._render_loop, daemon=True)
+        renderer.start()
+        
+        next_tick = time.monotonic()
         
         try:
             while self.running:
+                # One clock read per tick, shared by all records and both views
+                ts_iso = _iso_now()
+                ts_disp = ts_iso[:19].replace('T', ' ')
+                
                 # Generate simulated metrics
-                for slice_type in ['urllc', 'embb', 'mmtc']:
-                    if slice_type == 'urllc':
-                        bw = random.uniform(45, 60)
-                        lat = random.uniform(0.5, 1.5)
-                        jit = random.uniform(0.05, 0.15)
-                        pl = random.uniform(0, 0.002)
-                    elif slice_type == 'embb':
-                        bw = random.uniform(80, 120)
-                        lat = random.uniform(5, 15)
-                        jit = random.uniform(1, 3)
-                        pl = random.uniform(0, 0.02)
-                    else:  # mmtc
-                        bw = random.uniform(0.5, 2)
-                        lat = random.uniform(50, 150)
-                        jit = random.uniform(5, 15)
-                        pl = random.uniform(0, 0.15)
-                    
-                    self.record_metrics(slice_type, bw, lat, jit, pl)
+                for slice_type, (bw_r, lat_r, jit_r, pl_r) in demo_ranges:
+                    for _ in range(samples_per_tick):
+                        bw = uniform(*bw_r)
+                        lat = uniform(*lat_r)
+                        jit = uniform(*jit_r)
+                        pl = uniform(*pl_r)
+                        
+                        self.record_metrics(slice_type, bw, lat, jit, pl, timestamp=ts_iso)
+                self.flush_metrics()
                 
-                self.display_dashboard()
-                self.generate_html_report()
-                time.sleep(2)
+                self._render_time = ts_disp
+                self._render_ready.set()
+                
+                # Fixed-rate schedule; returns early when stop() is called
+                next_tick += self.REFRESH_INTERVAL_S
+                if self._stop.wait(max(0.0, next_tick - time.monotonic())):
+                    break
                 
         except KeyboardInterrupt:
             self.running = False
             print(f"\n{Colors.YELLOW}Monitoring stopped.{Colors.ENDC}")
             print(f"HTML report saved to: monitoring/reports/dashboard.html")
+        finally:
+            self.running = False
+            self._render_ready.set()
+            renderer.join()
+            self.close()
+    
+    def _render_loop(self):
+        """
+        Render the dashboard and HTML report for the latest demo tick.
+        
+        A rendering error (e.g. the report cannot be written) is printed and
+        stops the demo, rather than leaving a frozen dashboard behind.
+        """
+        while True:
+            self._render_ready.wait()
+            self._render_ready.clear()
+            if not self.running:
+                break
+            display_time = self._render_time
+            try:
+                self.display_dashboard(display_time)
+                self.generate_html_report(display_time)
+            except Exception as e:
+                print(f"\n{Colors.RED}Rendering failed, stopping: {e!r}{Colors.ENDC}")
+                self.stop()
+                break
     
     def run_live(self):
         """Run with live metrics from files."""
@@ -324,13 +566,21 @@ class SimpleMonitor:
         time.sleep(2)
         
         self.running = True
+        next_tick = time.monotonic()
         
         try:
             while self.running:
                 self.load_metrics_from_files()
-                self.display_dashboard()
-                self.generate_html_report()
-                time.sleep(2)
+                # Nothing new on disk: leave the current dashboard and report as they are
+                if self._dirty:
+                    ts_disp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    self.display_dashboard(ts_disp)
+                    self.generate_html_report(ts_disp)
+                    self._dirty = False
+                
+                next_tick += self.REFRESH_INTERVAL_S
+                if self._stop.wait(max(0.0, next_tick - time.monotonic())):
+                    break
                 
         except KeyboardInterrupt:
             self.running = False
@@ -344,16 +594,19 @@ def main():
     parser = argparse.ArgumentParser(description='5G Network Slicing Monitor')
     parser.add_argument('--demo', action='store_true', help='Run with simulated metrics')
     parser.add_argument('--report', action='store_true', help='Generate HTML report only')
+    parser.add_argument('--stress', type=int, default=1, metavar='N',
+                        help='Simulated samples per slice per refresh in demo mode (default: 1)')
     args = parser.parse_args()
     
     monitor = SimpleMonitor()
+    signal.signal(signal.SIGTERM, lambda signum, frame: monitor.stop())
     
     if args.report:
         monitor.load_metrics_from_files()
         report_path = monitor.generate_html_report()
         print(f"Report generated: {report_path}")
     elif args.demo:
-        monitor.run_demo()
+        monitor.run_demo(max(1, args.stress))
     else:
         monitor.run_live()
 
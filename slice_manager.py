@@ -19,13 +19,18 @@ Author: SDN-5G Project
 """
 
 import json
+import time
 import logging
+from operator import itemgetter
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Mapping, Optional, Any, Sequence, Tuple
 from pathlib import Path
+from types import MappingProxyType
 from datetime import datetime
 from enum import Enum
 
+import numpy as np
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('SliceManager')
@@ -56,6 +61,9 @@ class SLARequirements:
         max_jitter_ms: Maximum allowed jitter (ms)
         max_packet_loss_pct: Maximum allowed packet loss (%)
     """
+    __slots__ = ('min_bandwidth_mbps', 'max_latency_ms', 'max_jitter_ms',
+                 'max_packet_loss_pct')
+    
     min_bandwidth_mbps: float
     max_latency_ms: float
     max_jitter_ms: float
@@ -111,19 +119,138 @@ class SLAViolation:
         violation_type: Type of violation (bandwidth, latency, jitter, loss)
         expected_value: Expected SLA value
         actual_value: Actual measured value
-        timestamp: When the violation occurred
+        timestamp_ns: When the violation occurred (time.time_ns(), UTC epoch)
         severity: Severity level (minor, major, critical)
     """
     slice_name: str
     violation_type: str
     expected_value: float
     actual_value: float
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp_ns: int = field(default_factory=time.time_ns)
     severity: str = "minor"
     
+    @property
+    def timestamp(self) -> str:
+        """When the violation occurred, as an ISO 8601 UTC string (formatted on access)."""
+        return _utc_isoformat(self.timestamp_ns)
+    
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        return asdict(self)
+        """Convert to dictionary (with the ISO timestamp)."""
+        return {
+            'slice_name': self.slice_name,
+            'violation_type': self.violation_type,
+            'expected_value': self.expected_value,
+            'actual_value': self.actual_value,
+            'timestamp': self.timestamp,
+            'severity': self.severity
+        }
+
+
+# Violation types in the order check_sla() tests them, with whether the SLA
+# value is a minimum ('min') or a maximum ('max')
+VIOLATION_TYPES = ('bandwidth', 'latency', 'jitter', 'packet_loss')
+_LIMIT_KINDS = ('min', 'max', 'max', 'max')
+
+# Metrics dictionary keys, in the same order
+METRIC_KEYS = ('bandwidth_mbps', 'latency_ms', 'jitter_ms', 'packet_loss_pct')
+_metric_values = itemgetter(*METRIC_KEYS)
+
+# Severity levels, least severe first
+SEVERITIES = ('minor', 'major', 'critical')
+
+# Small integer ids stored in the violation log
+_TYPE_IDS = {name: i for i, name in enumerate(VIOLATION_TYPES)}
+_SEVERITY_IDS = {name: i for i, name in enumerate(SEVERITIES)}
+
+
+def _utc_isoformat(ts_ns: int) -> str:
+    """Format a time.time_ns() value like datetime.utcnow().isoformat()."""
+    seconds, ns = divmod(ts_ns, 1_000_000_000)
+    return datetime.utcfromtimestamp(seconds).replace(microsecond=ns // 1000).isoformat()
+
+
+class _ViolationLog:
+    """
+    Recorded SLA violations as parallel NumPy columns (struct-of-arrays).
+    
+    Each violation is one row of small ids and values instead of an
+    SLAViolation object. Capacity doubles when full up to max_size; after
+    that the columns are a ring buffer and the oldest rows are overwritten.
+    Per-type and per-severity counts are kept as rows are appended, so they
+    still cover the overwritten rows; with max_size=0 only the counts are kept.
+    """
+    
+    COLUMNS = (
+        ('slice_id', np.int16),
+        ('type_id', np.int8),
+        ('expected', np.float64),
+        ('actual', np.float64),
+        ('severity_id', np.int8),
+        ('ts_ns', np.int64)
+    )
+    
+    def __init__(self, capacity: int = 1024, max_size: int = 100_000):
+        if max_size < 0:
+            raise ValueError(f"max_size must be >= 0, got {max_size}")
+        self.size = 0
+        self._start = 0  # Row index of the oldest violation once the buffer wraps
+        self._max_size = max_size
+        self._capacity = min(max(capacity, 1), max_size)
+        self._columns = {name: np.empty(self._capacity, dtype=dtype) for name, dtype in self.COLUMNS}
+        self.type_counts = [0] * len(VIOLATION_TYPES)
+        self.severity_counts = [0] * len(SEVERITIES)
+    
+    def append(self, slice_id: int, type_id: int, expected: float, actual: float,
+               severity_id: int, ts_ns: int):
+        """Append one violation, overwriting the oldest when at max_size."""
+        self.type_counts[type_id] += 1
+        self.severity_counts[severity_id] += 1
+        if not self._max_size:
+            return
+        size = self.size
+        if size == self._capacity and size < self._max_size:
+            self._grow()
+        if size < self._capacity:
+            i = size
+            self.size = size + 1
+        else:
+            i = self._start
+            self._start = (i + 1) % self._capacity
+        columns = self._columns
+        columns['slice_id'][i] = slice_id
+        columns['type_id'][i] = type_id
+        columns['expected'][i] = expected
+        columns['actual'][i] = actual
+        columns['severity_id'][i] = severity_id
+        columns['ts_ns'][i] = ts_ns
+    
+    def _grow(self):
+        self._capacity = min(self._capacity * 2, self._max_size)
+        for name, column in self._columns.items():
+            grown = np.empty(self._capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self._columns[name] = grown
+    
+    def column(self, name: str, last: Optional[int] = None) -> np.ndarray:
+        """
+        One column over the held rows, oldest first.
+        
+        With last, only the newest `last` rows are returned. This is a view
+        until the buffer wraps, then a copy in chronological order.
+        """
+        count = self.size if last is None else max(0, min(last, self.size))
+        column = self._columns[name]
+        end = self._start + self.size  # One past the newest row, before wrapping
+        if end <= self._capacity:
+            return column[end - count:end]
+        return column.take(np.arange(end - count, end), mode='wrap')
+    
+    def clear(self):
+        """Drop all rows and counts (capacity is kept)."""
+        self.size = 0
+        self._start = 0
+        self.type_counts = [0] * len(VIOLATION_TYPES)
+        self.severity_counts = [0] * len(SEVERITIES)
 
 
 class SliceManager:
@@ -158,6 +285,10 @@ class SliceManager:
         )
     }
     
+    # Violations kept for get_recent_violations()/export_violations(); older ones
+    # are dropped, but still counted in get_violation_summary() (0 keeps counts only)
+    MAX_VIOLATIONS = 100_000
+    
     def __init__(self, config_dir: Optional[str] = None):
         """
         Initialize the Slice Manager.
@@ -166,20 +297,25 @@ class SliceManager:
             config_dir: Directory containing slice configuration files
         """
         self.config_dir = Path(config_dir) if config_dir else Path('config')
-        self.slices: Dict[str, SliceConfig] = {}
-        self.violations: List[SLAViolation] = []
+        self._slices: Dict[str, SliceConfig] = {}
         self.violation_counts: Dict[str, int] = {}
+        self._violation_log = _ViolationLog(max_size=self.MAX_VIOLATIONS)
+        
+        # Slice ids: index into the violation log and the SLA matrix. Ids are
+        # never reused, so logged violations keep their slice
+        self._slice_names: List[str] = []
+        self._slice_ids: Dict[str, int] = {}
         
         # Initialize default slices
         self._init_default_slices()
         
         logger.info("SliceManager initialized")
-        logger.info(f"Loaded {len(self.slices)} slice configurations")
+        logger.info(f"Loaded {len(self._slices)} slice configurations")
     
     def _init_default_slices(self):
         """Initialize default slice configurations."""
         # URLLC Slice
-        self.slices['URLLC'] = SliceConfig(
+        self._slices['URLLC'] = SliceConfig(
             name='URLLC',
             slice_type=SliceType.URLLC,
             port=5001,
@@ -190,7 +326,7 @@ class SliceManager:
         )
         
         # eMBB Slice
-        self.slices['eMBB'] = SliceConfig(
+        self._slices['eMBB'] = SliceConfig(
             name='eMBB',
             slice_type=SliceType.EMBB,
             port=5002,
@@ -201,7 +337,7 @@ class SliceManager:
         )
         
         # mMTC Slice
-        self.slices['mMTC'] = SliceConfig(
+        self._slices['mMTC'] = SliceConfig(
             name='mMTC',
             slice_type=SliceType.MMTC,
             port=5003,
@@ -211,9 +347,42 @@ class SliceManager:
             description='Massive Machine Type Communication for IoT devices'
         )
         
-        # Initialize violation counts
-        for name in self.slices:
-            self.violation_counts[name] = 0
+        self._reindex()
+    
+    @property
+    def slices(self) -> Mapping[str, SliceConfig]:
+        """Read-only view of the slice configurations (change them with add_slice())."""
+        return MappingProxyType(self._slices)
+    
+    def add_slice(self, config: SliceConfig):
+        """
+        Add a slice, or replace the configuration of an existing one.
+        
+        Args:
+            config: Slice configuration, keyed by config.name
+        """
+        self._slices[config.name] = config
+        self._reindex()
+    
+    def _reindex(self):
+        """Rebuild the lookups derived from the slice configurations."""
+        for name in self._slices:
+            self.violation_counts.setdefault(name, 0)
+            if name not in self._slice_ids:
+                self._slice_ids[name] = len(self._slice_names)
+                self._slice_names.append(name)
+        
+        # UDP port -> slice name for get_slice_by_port() (first slice wins on a shared port)
+        self._port_to_slice: Dict[int, str] = {}
+        for name, config in self._slices.items():
+            self._port_to_slice.setdefault(config.port, name)
+        
+        # SLA limits as one row per slice id: [min_bw, max_lat, max_jit, max_loss]
+        # (float64, so limits like 0.001 compare exactly as in check_sla())
+        self._sla_matrix = np.array([
+            [sla.min_bandwidth_mbps, sla.max_latency_ms, sla.max_jitter_ms, sla.max_packet_loss_pct]
+            for sla in (self._slices[name].sla for name in self._slice_names)
+        ], dtype=np.float64)
     
     def get_slice_config(self, slice_name: str) -> Optional[SliceConfig]:
         """
@@ -225,7 +394,7 @@ class SliceManager:
         Returns:
             SliceConfig or None if not found
         """
-        return self.slices.get(slice_name)
+        return self._slices.get(slice_name)
     
     def get_all_slices(self) -> Dict[str, SliceConfig]:
         """
@@ -234,7 +403,7 @@ class SliceManager:
         Returns:
             Dictionary of all slice configurations
         """
-        return self.slices.copy()
+        return dict(self._slices)
     
     def get_sla(self, slice_name: str) -> Optional[SLARequirements]:
         """
@@ -246,28 +415,51 @@ class SliceManager:
         Returns:
             SLARequirements or None if not found
         """
-        config = self.slices.get(slice_name)
+        config = self._slices.get(slice_name)
         return config.sla if config else None
     
-    def check_sla(self, slice_name: str, metrics: Dict[str, float]) -> Dict[str, Any]:
+    def check_sla(self, slice_name: str, metrics: Dict[str, float],
+                  include_details: bool = True) -> Dict[str, Any]:
         """
         Check if current metrics comply with slice SLA.
         
         Args:
             slice_name: Name of the slice
-            metrics: Dictionary with measured metrics:
+            metrics: Dictionary with measured metrics (missing ones count as 0):
                 - bandwidth_mbps: Measured bandwidth
                 - latency_ms: Measured latency
                 - jitter_ms: Measured jitter
                 - packet_loss_pct: Measured packet loss
+            include_details: Build the per-metric comparison; callers that
+                only need the status and violations can skip it
         
         Returns:
             Dictionary with:
                 - status: SLAStatus (compliant/violated)
                 - violations: List of specific violations
-                - details: Detailed comparison
+                - details: Detailed comparison (only with include_details)
         """
-        config = self.slices.get(slice_name)
+        try:
+            values = _metric_values(metrics)
+        except KeyError:
+            values = tuple(metrics.get(key, 0) for key in METRIC_KEYS)
+        return self.check_sla_values(slice_name, values, include_details)
+    
+    def check_sla_values(self, slice_name: str, values: Sequence[float],
+                         include_details: bool = True) -> Dict[str, Any]:
+        """
+        Check measured values against a slice SLA, without a metrics dictionary.
+        
+        Args:
+            slice_name: Name of the slice
+            values: Measured values in METRIC_KEYS order:
+                (bandwidth_mbps, latency_ms, jitter_ms, packet_loss_pct)
+            include_details: As for check_sla()
+        
+        Returns:
+            Same result as check_sla()
+        """
+        config = self._slices.get(slice_name)
         if not config:
             return {
                 'status': SLAStatus.UNKNOWN,
@@ -276,99 +468,210 @@ class SliceManager:
             }
         
         sla = config.sla
+        min_bw = sla.min_bandwidth_mbps
+        max_lat = sla.max_latency_ms
+        max_jit = sla.max_jitter_ms
+        max_loss = sla.max_packet_loss_pct
+        bandwidth, latency, jitter, packet_loss = values
         violations = []
-        details = {}
         
         # Check bandwidth (minimum requirement)
-        bandwidth = metrics.get('bandwidth_mbps', 0)
-        details['bandwidth'] = {
-            'required_min': sla.min_bandwidth_mbps,
-            'actual': bandwidth,
-            'compliant': bandwidth >= sla.min_bandwidth_mbps
-        }
-        if bandwidth < sla.min_bandwidth_mbps:
-            violation = SLAViolation(
+        if bandwidth < min_bw:
+            violations.append(SLAViolation(
                 slice_name=slice_name,
                 violation_type='bandwidth',
-                expected_value=sla.min_bandwidth_mbps,
+                expected_value=min_bw,
                 actual_value=bandwidth,
-                severity=self._get_severity(
-                    sla.min_bandwidth_mbps, bandwidth, 'min'
-                )
-            )
-            violations.append(violation)
+                severity=self._get_severity(min_bw, bandwidth, 'min')
+            ))
         
         # Check latency (maximum requirement)
-        latency = metrics.get('latency_ms', 0)
-        details['latency'] = {
-            'required_max': sla.max_latency_ms,
-            'actual': latency,
-            'compliant': latency <= sla.max_latency_ms
-        }
-        if latency > sla.max_latency_ms:
-            violation = SLAViolation(
+        if latency > max_lat:
+            violations.append(SLAViolation(
                 slice_name=slice_name,
                 violation_type='latency',
-                expected_value=sla.max_latency_ms,
+                expected_value=max_lat,
                 actual_value=latency,
-                severity=self._get_severity(
-                    sla.max_latency_ms, latency, 'max'
-                )
-            )
-            violations.append(violation)
+                severity=self._get_severity(max_lat, latency, 'max')
+            ))
         
         # Check jitter (maximum requirement)
-        jitter = metrics.get('jitter_ms', 0)
-        details['jitter'] = {
-            'required_max': sla.max_jitter_ms,
-            'actual': jitter,
-            'compliant': jitter <= sla.max_jitter_ms
-        }
-        if jitter > sla.max_jitter_ms:
-            violation = SLAViolation(
+        if jitter > max_jit:
+            violations.append(SLAViolation(
                 slice_name=slice_name,
                 violation_type='jitter',
-                expected_value=sla.max_jitter_ms,
+                expected_value=max_jit,
                 actual_value=jitter,
-                severity=self._get_severity(
-                    sla.max_jitter_ms, jitter, 'max'
-                )
-            )
-            violations.append(violation)
+                severity=self._get_severity(max_jit, jitter, 'max')
+            ))
         
         # Check packet loss (maximum requirement)
-        packet_loss = metrics.get('packet_loss_pct', 0)
-        details['packet_loss'] = {
-            'required_max': sla.max_packet_loss_pct,
-            'actual': packet_loss,
-            'compliant': packet_loss <= sla.max_packet_loss_pct
-        }
-        if packet_loss > sla.max_packet_loss_pct:
-            violation = SLAViolation(
+        if packet_loss > max_loss:
+            violations.append(SLAViolation(
                 slice_name=slice_name,
                 violation_type='packet_loss',
-                expected_value=sla.max_packet_loss_pct,
+                expected_value=max_loss,
                 actual_value=packet_loss,
-                severity=self._get_severity(
-                    sla.max_packet_loss_pct, packet_loss, 'max'
-                )
-            )
-            violations.append(violation)
+                severity=self._get_severity(max_loss, packet_loss, 'max')
+            ))
         
         # Update violation tracking
         if violations:
-            self.violations.extend(violations)
-            self.violation_counts[slice_name] += len(violations)
+            self._record_violations(slice_name, violations)
         
         # Determine overall status
         status = SLAStatus.COMPLIANT if not violations else SLAStatus.VIOLATED
         
-        return {
+        result = {
             'status': status,
-            'violations': [v.to_dict() for v in violations],
-            'details': details
+            'violations': [v.to_dict() for v in violations]
+        }
+        if include_details:
+            result['details'] = {
+                'bandwidth': {
+                    'required_min': min_bw,
+                    'actual': bandwidth,
+                    'compliant': bandwidth >= min_bw
+                },
+                'latency': {
+                    'required_max': max_lat,
+                    'actual': latency,
+                    'compliant': latency <= max_lat
+                },
+                'jitter': {
+                    'required_max': max_jit,
+                    'actual': jitter,
+                    'compliant': jitter <= max_jit
+                },
+                'packet_loss': {
+                    'required_max': max_loss,
+                    'actual': packet_loss,
+                    'compliant': packet_loss <= max_loss
+                }
+            }
+        return result
+    
+    def check_sla_batch(self, slice_name: str, bandwidth_mbps, latency_ms,
+                        jitter_ms, packet_loss_pct) -> Dict[str, Any]:
+        """
+        Check a batch of measurements against a slice SLA in one vectorized pass.
+        
+        Args:
+            slice_name: Name of the slice
+            bandwidth_mbps: Measured bandwidths (array-like)
+            latency_ms: Measured latencies (array-like, same length)
+            jitter_ms: Measured jitters (array-like, same length)
+            packet_loss_pct: Measured packet losses (array-like, same length)
+        
+        Returns:
+            Dictionary with:
+                - status: SLAStatus (violated if any sample violates)
+                - compliant: Boolean array, True for samples meeting every limit
+                - violations_by_type: Count of violating samples per type
+                - violations: List of specific violations, in sample order
+        
+        Violations are recorded as with check_sla().
+        """
+        slice_id = self._slice_ids.get(slice_name)
+        if slice_id is None:
+            return {
+                'status': SLAStatus.UNKNOWN,
+                'compliant': np.zeros(len(bandwidth_mbps), dtype=bool),
+                'violations_by_type': {},
+                'violations': []
+            }
+        limits = self._sla_matrix[slice_id]
+        
+        # One row per violation type, one column per sample
+        values = np.array([bandwidth_mbps, latency_ms, jitter_ms, packet_loss_pct],
+                          dtype=np.float64)
+        violated = np.empty(values.shape, dtype=bool)
+        np.less(values[0], limits[0], out=violated[0])
+        np.greater(values[1:], limits[1:, None], out=violated[1:])
+        
+        counts = np.count_nonzero(violated, axis=1)
+        compliant = ~violated.any(axis=0)
+        
+        # Build violation records only for the violating samples
+        violations = []
+        for i in np.flatnonzero(~compliant):
+            for t in np.flatnonzero(violated[:, i]):
+                expected = float(limits[t])
+                actual = float(values[t, i])
+                violations.append(SLAViolation(
+                    slice_name=slice_name,
+                    violation_type=VIOLATION_TYPES[t],
+                    expected_value=expected,
+                    actual_value=actual,
+                    severity=self._get_severity(expected, actual, _LIMIT_KINDS[t])
+                ))
+        
+        if violations:
+            self._record_violations(slice_name, violations)
+        
+        return {
+            'status': SLAStatus.VIOLATED if violations else SLAStatus.COMPLIANT,
+            'compliant': compliant,
+            'violations_by_type': dict(zip(VIOLATION_TYPES, counts.tolist())),
+            'violations': [v.to_dict() for v in violations]
         }
     
+    def _record_violations(self, slice_name: str, violations: List[SLAViolation]):
+        """
+        Timestamp a check's violations and append them to the violation log.
+        
+        All violations found by one check share a single timestamp.
+        """
+        ts_ns = time.time_ns()
+        slice_id = self._slice_ids[slice_name]
+        log = self._violation_log
+        for v in violations:
+            v.timestamp_ns = ts_ns
+            log.append(slice_id, _TYPE_IDS[v.violation_type], v.expected_value,
+                       v.actual_value, _SEVERITY_IDS[v.severity], ts_ns)
+        self.violation_counts[slice_name] += len(violations)
+    
+    @property
+    def violations(self) -> Tuple[SLAViolation, ...]:
+        """
+        Read-only snapshot of the held violations, oldest first.
+        
+        Same as get_recent_violations(None), so every access rebuilds the
+        objects. A tuple, so code that still mutates the list it used to be
+        fails loudly instead of changing a copy.
+        """
+        return tuple(self.get_recent_violations(None))
+    
+    def get_recent_violations(self, count: Optional[int] = 10) -> List[SLAViolation]:
+        """
+        Get the most recent violations, rebuilt from the violation log.
+        
+        Each call builds new SLAViolation objects (up to MAX_VIOLATIONS with
+        count=None); use violation_counts or get_violation_summary() for counts.
+        
+        Args:
+            count: Number of violations to return (None for all held)
+        
+        Returns:
+            List of SLAViolation, oldest first
+        """
+        log = self._violation_log
+        return [
+            SLAViolation(
+                slice_name=self._slice_names[slice_id],
+                violation_type=VIOLATION_TYPES[type_id],
+                expected_value=expected,
+                actual_value=actual,
+                timestamp_ns=ts_ns,
+                severity=SEVERITIES[severity_id]
+            )
+            for slice_id, type_id, expected, actual, severity_id, ts_ns in zip(
+                log.column('slice_id', count).tolist(), log.column('type_id', count).tolist(),
+                log.column('expected', count).tolist(), log.column('actual', count).tolist(),
+                log.column('severity_id', count).tolist(), log.column('ts_ns', count).tolist()
+            )
+        ]
+    
     def _get_severity(self, expected: float, actual: float, 
                       requirement_type: str) -> str:
         """
@@ -385,24 +688,14 @@ class SliceManager:
         if expected == 0:
             return 'critical'
         
+        # Index into SEVERITIES from how many thresholds the ratio fails
+        # (written as 'not <=' / 'not >=' so a NaN ratio stays critical)
+        ratio = actual / expected
         if requirement_type == 'min':
             # For minimum requirements (e.g., bandwidth)
-            ratio = actual / expected
-            if ratio >= 0.8:
-                return 'minor'
-            elif ratio >= 0.5:
-                return 'major'
-            else:
-                return 'critical'
-        else:
-            # For maximum requirements (e.g., latency)
-            ratio = actual / expected
-            if ratio <= 1.2:
-                return 'minor'
-            elif ratio <= 2.0:
-                return 'major'
-            else:
-                return 'critical'
+            return SEVERITIES[(not ratio >= 0.8) + (not ratio >= 0.5)]
+        # For maximum requirements (e.g., latency)
+        return SEVERITIES[(not ratio <= 1.2) + (not ratio <= 2.0)]
     
     def get_violation_summary(self) -> Dict[str, Any]:
         """
@@ -411,29 +704,24 @@ class SliceManager:
         Returns:
             Dictionary with violation statistics
         """
+        log = self._violation_log
+        
+        # Running counts kept by the violation log, so this does not scan it
         summary = {
-            'total_violations': len(self.violations),
+            'total_violations': sum(log.type_counts),
             'violations_by_slice': self.violation_counts.copy(),
-            'violations_by_type': {},
-            'severity_distribution': {
-                'minor': 0,
-                'major': 0,
-                'critical': 0
-            }
+            'violations_by_type': {
+                vtype: count
+                for vtype, count in zip(VIOLATION_TYPES, log.type_counts) if count
+            },
+            'severity_distribution': dict(zip(SEVERITIES, log.severity_counts))
         }
         
-        # Count by type and severity
-        for v in self.violations:
-            vtype = v.violation_type
-            summary['violations_by_type'][vtype] = \
-                summary['violations_by_type'].get(vtype, 0) + 1
-            summary['severity_distribution'][v.severity] += 1
-        
         return summary
     
     def clear_violations(self):
         """Clear all recorded violations."""
-        self.violations = []
+        self._violation_log.clear()
         for name in self.violation_counts:
             self.violation_counts[name] = 0
         logger.info("Violations cleared")
@@ -447,7 +735,7 @@ class SliceManager:
         """
         config_data = {
             name: config.to_dict() 
-            for name, config in self.slices.items()
+            for name, config in self._slices.items()
         }
         
         with open(output_path, 'w') as f:
@@ -464,7 +752,7 @@ class SliceManager:
         """
         violations_data = {
             'summary': self.get_violation_summary(),
-            'violations': [v.to_dict() for v in self.violations]
+            'violations': [v.to_dict() for v in self.get_recent_violations(None)]
         }
         
         with open(output_path, 'w') as f:
@@ -482,10 +770,7 @@ class SliceManager:
         Returns:
             Slice name or None
         """
-        for name, config in self.slices.items():
-            if config.port == port:
-                return name
-        return None
+        return self._port_to_slice.get(port)
     
     def format_sla_report(self, slice_name: str) -> str:
         """
@@ -497,7 +782,7 @@ class SliceManager:
         Returns:
             Formatted string report
         """
-        config = self.slices.get(slice_name)
+        config = self._slices.get(slice_name)
         if not config:
             return f"Unknown slice: {slice_name}"
         
@@ -0,0 +1,81 @@
+import importlib
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# The AI modules import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ai"))
+
+import ml_model
+import shared_metrics
+
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    """predictor_api imported in a directory holding a small trained model."""
+    model_dir = tmp_path_factory.mktemp("model")
+    rng = np.random.default_rng(0)
+    model = ml_model.train_model(rng.random((60, 5)), rng.integers(0, 3, 60), n_estimators=3)
+    ml_model.save_model(model, str(model_dir / "traffic_model.joblib"))
+
+    cwd = os.getcwd()
+    os.chdir(model_dir)
+    try:
+        yield importlib.import_module("predictor_api")
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def client(api):
+    return api.app.test_client()
+
+
+def test_slices_stale_segment_is_rejected(api, client, monkeypatch):
+    name = f"sdn_metrics_test_{uuid.uuid4().hex[:8]}"
+    writer = shared_metrics.SharedMetricsWriter(["URLLC", "eMBB"], name=name)
+    try:
+        # Last published a minute ago by a controller that has since died
+        monkeypatch.setattr(shared_metrics, "time", SimpleNamespace(time=lambda: time.time() - 60))
+        writer.publish([1.0, 2.0], [3.0, 4.0])
+        monkeypatch.undo()
+
+        # Attaching now must not make the old snapshot look fresh
+        monkeypatch.setattr(api, "_slice_metrics", shared_metrics.SharedMetricsReader(name=name))
+        response = client.get("/predict/slices")
+        assert response.status_code == 503
+        assert response.get_json()["age_s"] >= 60
+
+        writer.publish([1.0, 2.0], [3.0, 4.0])
+        response = client.get("/predict/slices")
+        assert response.status_code == 200
+        assert set(response.get_json()["predictions"]) == {"URLLC", "eMBB"}
+    finally:
+        api._slice_metrics.close()
+        writer.close()
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", 1e999])
+def test_predict_rejects_non_finite_feature(client, value):
+    features = {"latency": 50, "throughput": 500, "packet_loss": 0.5, "jitter": 10, "traffic_volume": 1000}
+    features["latency"] = value
+    response = client.post("/predict", json=features)
+    assert response.status_code == 400
+
+
+def test_export_older_than_model_is_not_served(api, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / api.MODEL_FILE).touch()
+    (tmp_path / api.ONNX_MODEL_FILE).touch()
+    os.utime(api.ONNX_MODEL_FILE, ns=(0, 0))
+    assert not api._export_is_current(api.ONNX_MODEL_FILE)
+
+    os.utime(api.ONNX_MODEL_FILE)
+    assert api._export_is_current(api.ONNX_MODEL_FILE)
+    assert not api._export_is_current(api.TREELITE_MODEL_FILE)